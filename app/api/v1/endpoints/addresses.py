@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user, get_db
 from app.crud.address import address
+from app.models.address import Address
 from app.models.user import User
 from app.schemas.address import (
     AddressCreate, 
@@ -27,7 +28,7 @@ def get_user_addresses(
     address_type: Optional[str] = None,
     skip: int = 0,
     limit: int = 100
-) -> List[AddressPublic]:
+) -> List[Address]:
     """
     Get all addresses for the current user.
     
@@ -52,7 +53,8 @@ def get_user_addresses(
             limit=limit
         )
     
-    return [AddressPublic.model_validate(addr) for addr in addresses]
+    # response_model validates the ORM rows once (from_attributes)
+    return addresses
 
 
 @router.get("/default", response_model=Optional[AddressPublic])
@@ -213,7 +215,7 @@ def get_addresses_by_type(
     current_user: User = Depends(get_current_active_user),
     address_type: str,
     active_only: bool = True
-) -> List[AddressSummary]:
+) -> List[Address]:
     """
     Get addresses by type (shipping, billing, both).
     
@@ -233,4 +235,5 @@ def get_addresses_by_type(
         active_only=active_only
     )
     
-    return [AddressSummary.model_validate(addr) for addr in addresses]
+    # response_model validates the ORM rows once (from_attributes)
+    return addresses
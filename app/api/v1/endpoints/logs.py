@@ -188,9 +188,19 @@ async def search_logs(
         if level:
             query_conditions.append(LogEntry.level == level.upper())
         
-        # Execute search
+        # Execute search, fetching only the columns in the results
         logs = (
-            db.query(LogEntry)
+            db.query(
+                LogEntry.timestamp,
+                LogEntry.level,
+                LogEntry.logger_name,
+                LogEntry.message,
+                LogEntry.module,
+                LogEntry.function,
+                LogEntry.line_number,
+                LogEntry.user_id,
+                LogEntry.request_id
+            )
             .filter(and_(*query_conditions))
             .order_by(LogEntry.timestamp.desc())
             .limit(limit)
@@ -0,0 +1,82 @@
+"""
+Command line entrypoint for one-off application tasks.
+
+Usage:
+    python -m app.cli init-db
+    python -m app.cli cleanup-sessions
+    python -m app.cli convert-guids
+    python -m app.cli convert-profile-flags
+"""
+
+import argparse
+import sys
+
+
+def init_db_command() -> int:
+    """Create tables, default user types and the superuser."""
+    from app.db.init_db import init_db
+
+    init_db()
+    return 0
+
+
+def cleanup_sessions_command() -> int:
+    """Permanently delete expired and long-revoked sessions in batches."""
+    from app.crud.session import session as session_crud
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        batch_size = 5000
+        total = 0
+        while True:
+            deleted = session_crud.purge_expired_sessions(db, batch_size=batch_size)
+            db.commit()
+            total += deleted
+            if deleted < batch_size:
+                break
+    finally:
+        db.close()
+    print(f"Deleted {total} sessions")
+    return 0
+
+
+def convert_guids_command() -> int:
+    """Convert text GUIDs in an existing SQLite database to 16-byte values."""
+    import app.db.init_db  # noqa: F401  (registers every model on Base.metadata)
+    from app.db.base import convert_legacy_guids
+    from app.db.session import engine
+
+    print(f"Converted {convert_legacy_guids(engine)} ids")
+    return 0
+
+
+def convert_profile_flags_command() -> int:
+    """Convert text profile privacy flags to the Boolean/Enum columns."""
+    from app.db.init_db import convert_legacy_profile_flags
+    from app.db.session import engine
+
+    print(f"Converted {convert_legacy_profile_flags(engine)} profile flags")
+    return 0
+
+
+def main(argv=None) -> int:
+    """Main CLI function."""
+    parser = argparse.ArgumentParser(description="Application management commands")
+    parser.add_argument("command", choices=["init-db", "cleanup-sessions", "convert-guids", "convert-profile-flags"], help="Command to run")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "init-db":
+        return init_db_command()
+    if args.command == "cleanup-sessions":
+        return cleanup_sessions_command()
+    if args.command == "convert-guids":
+        return convert_guids_command()
+    if args.command == "convert-profile-flags":
+        return convert_profile_flags_command()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
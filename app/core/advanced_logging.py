@@ -14,8 +14,9 @@ import logging
 import logging.handlers
 import os
 import sys
+import threading
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 import json
 from pathlib import Path
 import structlog
@@ -25,11 +26,11 @@ import sentry_sdk
 from sentry_sdk.integrations.logging import LoggingIntegration
 from elasticsearch import Elasticsearch
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine, Column, String, DateTime, Text, Integer
+from sqlalchemy import create_engine, insert, Column, String, DateTime, Text, Integer, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.base import JSONType
 
 
 # Database model for storing critical logs
@@ -40,17 +41,34 @@ class LogEntry(LogBase):
     __tablename__ = "log_entries"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, default=datetime.utcnow)  # indexed via idx_logentry_timestamp_level
     level = Column(String(20), index=True)
     logger_name = Column(String(100), index=True)
     message = Column(Text)
     module = Column(String(100))
     function = Column(String(100))
     line_number = Column(Integer)
-    extra_data = Column(Text)  # JSON string for additional context
+    extra_data = Column(JSONType)  # Additional context (JSONB on PostgreSQL)
     user_id = Column(String(100), index=True, nullable=True)
     request_id = Column(String(100), index=True, nullable=True)
     ip_address = Column(String(50), nullable=True)
+    
+    # Log reports filter on a time window, usually with a level or
+    # extra_data->>'event_type' predicate; error checks hit the partial index.
+    __table_args__ = (
+        Index("idx_logentry_timestamp_level", timestamp, level),
+        Index(
+            "idx_logentry_errors",
+            timestamp,
+            postgresql_where=level.in_(["ERROR", "CRITICAL"]),
+            sqlite_where=level.in_(["ERROR", "CRITICAL"]),
+        ),
+        Index(
+            "idx_logentry_event_type",
+            extra_data["event_type"].as_string(),
+            timestamp.desc(),
+        ).ddl_if(dialect="postgresql"),
+    )
 
 
 class ElasticsearchHandler(logging.Handler):
@@ -122,24 +140,42 @@ class ElasticsearchHandler(logging.Handler):
 
 
 class DatabaseHandler(logging.Handler):
-    """Custom handler to store critical logs in database."""
+    """Custom handler to store critical logs in database.
+    
+    Records are buffered and written with one executemany INSERT when
+    ``BATCH_SIZE`` rows are pending, or every ``FLUSH_INTERVAL_SECONDS`` by a
+    background thread. ``logging.shutdown()`` flushes what is left at exit.
+    """
+    
+    BATCH_SIZE = 200
+    FLUSH_INTERVAL_SECONDS = 2.0
     
     def __init__(self, database_url: str):
         super().__init__()
-        self.engine = create_engine(database_url)
+        # Context values that aren't JSON types are stored as their str()
+        self.engine = create_engine(
+            database_url,
+            json_serializer=lambda obj: json.dumps(obj, default=str)
+        )
         LogBase.metadata.create_all(self.engine)
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        self.SessionLocal = SessionLocal
+        self._buffer: List[Dict[str, Any]] = []
+        self._stop_flushing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, name="log-db-flusher", daemon=True
+        )
+        self._flusher.start()
+    
+    def _flush_periodically(self) -> None:
+        while not self._stop_flushing.wait(self.FLUSH_INTERVAL_SECONDS):
+            self.flush()
     
     def emit(self, record):
-        """Store critical log record in database."""
+        """Buffer critical log record for the next database write."""
         # Only store WARNING and above in database
         if record.levelno < logging.WARNING:
             return
         
         try:
-            db = self.SessionLocal()
-            
             # Extract extra fields
             extra_fields = {
                 k: v for k, v in record.__dict__.items()
@@ -152,26 +188,42 @@ class DatabaseHandler(logging.Handler):
                 }
             }
             
-            log_entry = LogEntry(
-                timestamp=datetime.now(timezone.utc),
-                level=record.levelname,
-                logger_name=record.name,
-                message=record.getMessage(),
-                module=record.module,
-                function=record.funcName,
-                line_number=record.lineno,
-                extra_data=json.dumps(extra_fields, default=str) if extra_fields else None,
-                user_id=extra_fields.get('user_id'),
-                request_id=extra_fields.get('request_id'),
-                ip_address=extra_fields.get('ip_address')
-            )
-            
-            db.add(log_entry)
-            db.commit()
-            db.close()
+            self._buffer.append({
+                "timestamp": datetime.now(timezone.utc),
+                "level": record.levelname,
+                "logger_name": record.name,
+                "message": record.getMessage(),
+                "module": record.module,
+                "function": record.funcName,
+                "line_number": record.lineno,
+                "extra_data": extra_fields or None,
+                "user_id": extra_fields.get('user_id'),
+                "request_id": extra_fields.get('request_id'),
+                "ip_address": extra_fields.get('ip_address')
+            })
+            if len(self._buffer) >= self.BATCH_SIZE:
+                self.flush()
             
         except Exception as e:
             print(f"Error storing log in database: {e}")
+    
+    def flush(self):
+        """Write buffered log rows in one INSERT."""
+        with self.lock:
+            rows, self._buffer = self._buffer, []
+            if not rows:
+                return
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(insert(LogEntry), rows)
+            except Exception as e:
+                print(f"Error storing {len(rows)} logs in database: {e}")
+    
+    def close(self):
+        """Stop the background flusher and write any remaining rows."""
+        self._stop_flushing.set()
+        self.flush()
+        super().close()
 
 
 class AdvancedLogger:
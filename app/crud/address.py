@@ -12,10 +12,7 @@ class CRUDAddress:
     def get(self, db: Session, address_id: UUID) -> Optional[Address]:
         """Get address by ID."""
         return db.query(Address).filter(
-            and_(
-                Address.id == address_id,
-                Address.is_deleted == False
-            )
+            Address.id == address_id
         ).first()
     
     def get_user_addresses(
@@ -28,10 +25,7 @@ class CRUDAddress:
     ) -> List[Address]:
         """Get all addresses for a specific user."""
         query = db.query(Address).filter(
-            and_(
-                Address.user_id == user_id,
-                Address.is_deleted == False
-            )
+            Address.user_id == user_id
         )
         
         if active_only:
@@ -52,8 +46,7 @@ class CRUDAddress:
         return db.query(Address).filter(
             and_(
                 Address.id == address_id,
-                Address.user_id == user_id,
-                Address.is_deleted == False
+                Address.user_id == user_id
             )
         ).first()
     
@@ -67,8 +60,7 @@ class CRUDAddress:
             and_(
                 Address.user_id == user_id,
                 Address.is_default == True,
-                Address.is_active == True,
-                Address.is_deleted == False
+                Address.is_active == True
             )
         ).first()
     
@@ -98,8 +90,7 @@ class CRUDAddress:
             **address_data
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def update(
@@ -124,8 +115,7 @@ class CRUDAddress:
             setattr(db_obj, field, value)
         
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def set_default_address(
@@ -145,8 +135,7 @@ class CRUDAddress:
         # Set new default
         address.is_default = True
         db.add(address)
-        db.commit()
-        db.refresh(address)
+        db.flush()
         return address
     
     def remove(
@@ -173,7 +162,7 @@ class CRUDAddress:
             # Hard delete
             db.delete(address)
         
-        db.commit()
+        db.flush()
         
         # If this was the default address, set another active address as default
         if was_default:
@@ -181,7 +170,7 @@ class CRUDAddress:
             if remaining_addresses:
                 remaining_addresses[0].is_default = True
                 db.add(remaining_addresses[0])
-                db.commit()
+                db.flush()
         
         return address
     
@@ -196,8 +185,7 @@ class CRUDAddress:
         query = db.query(Address).filter(
             and_(
                 Address.user_id == user_id,
-                Address.address_type.in_([address_type, 'both']),
-                Address.is_deleted == False
+                Address.address_type.in_([address_type, 'both'])
             )
         )
         
@@ -216,8 +204,7 @@ class CRUDAddress:
         query = db.query(Address).filter(
             and_(
                 Address.user_id == user_id,
-                Address.is_default == True,
-                Address.is_deleted == False
+                Address.is_default == True
             )
         )
         
@@ -228,7 +215,7 @@ class CRUDAddress:
             address.is_default = False
             db.add(address)
         
-        db.commit()
+        db.flush()
 
 
 # Create the CRUD instance
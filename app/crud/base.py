@@ -22,25 +22,21 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get(self, db: Session, id: UUID) -> Optional[ModelType]:
         """Get object by ID."""
         return db.query(self.model).filter(
-            self.model.id == id, 
-            self.model.is_deleted == False
+            self.model.id == id
         ).first()
 
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
         """Get multiple objects with pagination."""
-        return db.query(self.model).filter(
-            self.model.is_deleted == False
-        ).offset(skip).limit(limit).all()
+        return db.query(self.model).offset(skip).limit(limit).all()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """Create new object."""
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def update(
@@ -60,16 +56,15 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def remove(self, db: Session, *, id: UUID) -> Optional[ModelType]:
         """Permanently delete object."""
-        obj = db.query(self.model).get(id)
+        obj = db.query(self.model).execution_options(include_deleted=True).get(id)
         if obj:
             db.delete(obj)
-            db.commit()
+            db.flush()
             return obj
         return None
 
@@ -78,7 +73,6 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = self.get(db, id=id)
         if obj:
             obj.is_deleted = True
-            db.commit()
-            db.refresh(obj)
+            db.flush()
             return obj
         return None
@@ -10,20 +10,19 @@ class CRUDCategory:
     
     def get(self, db: Session, id: uuid.UUID) -> Optional[Category]:
         """Get category by UUID."""
-        return db.query(Category).filter(Category.id == id, Category.is_deleted == False).first()
+        return db.query(Category).filter(Category.id == id).first()
     
     def get_by_name(self, db: Session, *, name: str, department_id: uuid.UUID) -> Optional[Category]:
         """Get category by name within a department."""
         return db.query(Category).filter(
             Category.name == name,
-            Category.department_id == department_id,
-            Category.is_deleted == False
+            Category.department_id == department_id
         ).first()
     
     def get_by_slug(self, db: Session, *, slug: str) -> Optional[Category]:
         """Get category by slug."""
         return db.query(Category).filter(
-            Category.slug == slug, Category.is_deleted == False
+            Category.slug == slug
         ).first()
     
     def get_by_department(
@@ -32,7 +31,7 @@ class CRUDCategory:
         """Get categories by department."""
         return (
             db.query(Category)
-            .filter(Category.department_id == department_id, Category.is_deleted == False)
+            .filter(Category.department_id == department_id)
             .order_by(Category.display_order, Category.name)
             .offset(skip)
             .limit(limit)
@@ -47,8 +46,7 @@ class CRUDCategory:
             db.query(Category)
             .filter(
                 Category.department_id == department_id,
-                Category.is_active == True,
-                Category.is_deleted == False
+                Category.is_active == True
             )
             .order_by(Category.display_order, Category.name)
             .offset(skip)
@@ -62,7 +60,6 @@ class CRUDCategory:
         """Get multiple categories with pagination."""
         return (
             db.query(Category)
-            .filter(Category.is_deleted == False)
             .order_by(Category.display_order, Category.name)
             .offset(skip)
             .limit(limit)
@@ -84,8 +81,7 @@ class CRUDCategory:
             image_url=obj_in.image_url
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def update(
@@ -97,8 +93,7 @@ class CRUDCategory:
         for field, value in obj_data.items():
             setattr(db_obj, field, value)
         
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def remove(self, db: Session, *, id: uuid.UUID) -> Optional[Category]:
@@ -106,7 +101,7 @@ class CRUDCategory:
         obj = self.get(db=db, id=id)
         if obj:
             obj.is_deleted = True
-            db.commit()
+            db.flush()
         return obj
 
 
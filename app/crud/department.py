@@ -10,18 +10,18 @@ class CRUDDepartment:
     
     def get(self, db: Session, id: uuid.UUID) -> Optional[Department]:
         """Get department by UUID."""
-        return db.query(Department).filter(Department.id == id, Department.is_deleted == False).first()
+        return db.query(Department).filter(Department.id == id).first()
     
     def get_by_name(self, db: Session, *, name: str) -> Optional[Department]:
         """Get department by name."""
         return db.query(Department).filter(
-            Department.name == name, Department.is_deleted == False
+            Department.name == name
         ).first()
     
     def get_by_slug(self, db: Session, *, slug: str) -> Optional[Department]:
         """Get department by slug."""
         return db.query(Department).filter(
-            Department.slug == slug, Department.is_deleted == False
+            Department.slug == slug
         ).first()
     
     def get_multi(
@@ -30,7 +30,6 @@ class CRUDDepartment:
         """Get multiple departments with pagination."""
         return (
             db.query(Department)
-            .filter(Department.is_deleted == False)
             .order_by(Department.display_order, Department.name)
             .offset(skip)
             .limit(limit)
@@ -41,7 +40,7 @@ class CRUDDepartment:
         """Get active departments."""
         return (
             db.query(Department)
-            .filter(Department.is_active == True, Department.is_deleted == False)
+            .filter(Department.is_active == True)
             .order_by(Department.display_order, Department.name)
             .offset(skip)
             .limit(limit)
@@ -62,8 +61,7 @@ class CRUDDepartment:
             image_url=obj_in.image_url
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def update(
@@ -75,8 +73,7 @@ class CRUDDepartment:
         for field, value in obj_data.items():
             setattr(db_obj, field, value)
         
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def remove(self, db: Session, *, id: uuid.UUID) -> Optional[Department]:
@@ -84,7 +81,7 @@ class CRUDDepartment:
         obj = self.get(db=db, id=id)
         if obj:
             obj.is_deleted = True
-            db.commit()
+            db.flush()
         return obj
 
 
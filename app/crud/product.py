@@ -1,33 +1,38 @@
+import re
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_, or_, desc, asc, func, select
+from sqlalchemy.engine import Row
 from decimal import Decimal
 
 from app.crud.base import CRUDBase
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate, ProductSearchRequest
 
+_SLUG_STRIP = re.compile(r'[^a-zA-Z0-9\s-]')
+_SLUG_SPACES = re.compile(r'\s+')
+
 
 class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     """CRUD operations for Product model."""
     
     def get_by_sku(self, db: Session, *, sku: str) -> Optional[Product]:
-        """Get product by SKU."""
+        """Get product by SKU (case-insensitive, served by an upper(sku) index)."""
         return db.query(Product).filter(
-            and_(Product.sku == sku.upper(), Product.is_deleted == False)
+            func.upper(Product.sku) == sku.upper()
         ).first()
     
     def get_by_slug(self, db: Session, *, slug: str) -> Optional[Product]:
         """Get product by slug."""
         return db.query(Product).filter(
-            and_(Product.slug == slug, Product.is_deleted == False)
+            Product.slug == slug
         ).first()
     
     def get_by_barcode(self, db: Session, *, barcode: str) -> Optional[Product]:
         """Get product by barcode."""
         return db.query(Product).filter(
-            and_(Product.barcode == barcode, Product.is_deleted == False)
+            Product.barcode == barcode
         ).first()
     
     def get_active_products(
@@ -39,9 +44,25 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     ) -> List[Product]:
         """Get all active products."""
         return db.query(Product).filter(
-            and_(Product.is_active == True, Product.is_deleted == False)
+            Product.is_active == True
         ).offset(skip).limit(limit).all()
     
+    def get_active_products_light(
+        self, 
+        db: Session, 
+        *, 
+        skip: int = 0, 
+        limit: int = 100
+    ) -> List[Row]:
+        """Get active products as lightweight rows (id, name, slug, price, quantity)."""
+        stmt = (
+            select(Product.id, Product.name, Product.slug, Product.price, Product.quantity)
+            .where(Product.is_active == True)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(db.execute(stmt).all())
+    
     def get_featured_products(
         self, 
         db: Session, 
@@ -53,8 +74,7 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         return db.query(Product).filter(
             and_(
                 Product.is_featured == True,
-                Product.is_active == True,
-                Product.is_deleted == False
+                Product.is_active == True
             )
         ).order_by(Product.display_order, Product.name).offset(skip).limit(limit).all()
     
@@ -69,7 +89,7 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     ) -> List[Product]:
         """Get products by category."""
         query = db.query(Product).filter(
-            and_(Product.category_id == category_id, Product.is_deleted == False)
+            Product.category_id == category_id
         )
         
         if active_only:
@@ -88,7 +108,7 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     ) -> List[Product]:
         """Get products by subcategory."""
         query = db.query(Product).filter(
-            and_(Product.subcategory_id == subcategory_id, Product.is_deleted == False)
+            Product.subcategory_id == subcategory_id
         )
         
         if active_only:
@@ -107,7 +127,7 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     ) -> List[Product]:
         """Get products by brand."""
         query = db.query(Product).filter(
-            and_(Product.brand == brand, Product.is_deleted == False)
+            Product.brand == brand
         )
         
         if active_only:
@@ -126,7 +146,7 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     ) -> List[Product]:
         """Get products by vendor."""
         query = db.query(Product).filter(
-            and_(Product.vendor == vendor, Product.is_deleted == False)
+            Product.vendor == vendor
         )
         
         if active_only:
@@ -146,8 +166,7 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
             and_(
                 Product.track_inventory == True,
                 Product.quantity <= Product.low_stock_threshold,
-                Product.is_active == True,
-                Product.is_deleted == False
+                Product.is_active == True
             )
         ).order_by(Product.quantity).offset(skip).limit(limit).all()
     
@@ -164,8 +183,7 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
                 Product.track_inventory == True,
                 Product.quantity == 0,
                 Product.allow_backorder == False,
-                Product.is_active == True,
-                Product.is_deleted == False
+                Product.is_active == True
             )
         ).order_by(Product.name).offset(skip).limit(limit).all()
     
@@ -177,62 +195,49 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         skip: int = 0, 
         limit: int = 100
     ) -> List[Product]:
-        """Search products with multiple filters."""
-        query = db.query(Product).filter(Product.is_deleted == False)
-        
-        # Text search
-        if search_params.query:
-            search_term = f"%{search_params.query}%"
-            query = query.filter(
-                or_(
-                    Product.name.ilike(search_term),
-                    Product.description.ilike(search_term),
-                    Product.short_description.ilike(search_term),
-                    Product.sku.ilike(search_term),
-                    Product.brand.ilike(search_term),
-                    Product.tags.ilike(search_term)
-                )
-            )
+        """Search products with multiple filters.
+
+        Filters are collected into a single WHERE clause, cheapest and most
+        selective first, with the ILIKE text search last.
+        """
+        # Active products only
+        filters = [Product.is_active == True]
         
         # Category filter
         if search_params.category_id:
-            query = query.filter(Product.category_id == search_params.category_id)
+            filters.append(Product.category_id == search_params.category_id)
         
         # Subcategory filter
         if search_params.subcategory_id:
-            query = query.filter(Product.subcategory_id == search_params.subcategory_id)
+            filters.append(Product.subcategory_id == search_params.subcategory_id)
         
         # Brand filter
         if search_params.brand:
-            query = query.filter(Product.brand == search_params.brand)
+            filters.append(Product.brand == search_params.brand)
         
         # Vendor filter
         if search_params.vendor:
-            query = query.filter(Product.vendor == search_params.vendor)
+            filters.append(Product.vendor == search_params.vendor)
+        
+        # Featured filter
+        if search_params.is_featured is not None:
+            filters.append(Product.is_featured == search_params.is_featured)
         
         # Price range filter
         if search_params.min_price is not None:
-            query = query.filter(Product.price >= search_params.min_price)
+            filters.append(Product.price >= search_params.min_price)
         
         if search_params.max_price is not None:
-            query = query.filter(Product.price <= search_params.max_price)
-        
-        # Featured filter
-        if search_params.is_featured is not None:
-            query = query.filter(Product.is_featured == search_params.is_featured)
+            filters.append(Product.price <= search_params.max_price)
         
         # On sale filter
         if search_params.is_on_sale:
-            query = query.filter(
-                and_(
-                    Product.compare_at_price.isnot(None),
-                    Product.compare_at_price > Product.price
-                )
-            )
+            filters.append(Product.compare_at_price.isnot(None))
+            filters.append(Product.compare_at_price > Product.price)
         
         # Stock filter
         if search_params.in_stock_only:
-            query = query.filter(
+            filters.append(
                 or_(
                     Product.track_inventory == False,
                     and_(
@@ -245,8 +250,21 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
                 )
             )
         
-        # Active products only
-        query = query.filter(Product.is_active == True)
+        # Text search
+        if search_params.query:
+            search_term = f"%{search_params.query}%"
+            filters.append(
+                or_(
+                    Product.name.ilike(search_term),
+                    Product.description.ilike(search_term),
+                    Product.short_description.ilike(search_term),
+                    Product.sku.ilike(search_term),
+                    Product.brand.ilike(search_term),
+                    Product.tags.ilike(search_term)
+                )
+            )
+        
+        query = db.query(Product).filter(*filters)
         
         # Sorting
         sort_field = getattr(Product, search_params.sort_by, Product.name)
@@ -271,8 +289,7 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         
         new_quantity = max(0, product.quantity + quantity_change)
         product.quantity = new_quantity
-        db.commit()
-        db.refresh(product)
+        db.flush()
         return product
     
     def set_inventory(
@@ -288,31 +305,30 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
             return None
         
         product.quantity = max(0, quantity)
-        db.commit()
-        db.refresh(product)
+        db.flush()
         return product
     
     def get_brands(self, db: Session) -> List[str]:
         """Get all unique brands."""
         result = db.query(Product.brand).filter(
             and_(
-                Product.brand.isnot(None), 
-                Product.is_active == True,
-                Product.is_deleted == False
+                Product.brand.isnot(None),
+                Product.brand != "",
+                Product.is_active == True
             )
-        ).distinct().all()
-        return [brand[0] for brand in result if brand[0]]
+        ).distinct().order_by(Product.brand).yield_per(1000)
+        return [brand for (brand,) in result]
     
     def get_vendors(self, db: Session) -> List[str]:
         """Get all unique vendors."""
         result = db.query(Product.vendor).filter(
             and_(
-                Product.vendor.isnot(None), 
-                Product.is_active == True,
-                Product.is_deleted == False
+                Product.vendor.isnot(None),
+                Product.vendor != "",
+                Product.is_active == True
             )
-        ).distinct().all()
-        return [vendor[0] for vendor in result if vendor[0]]
+        ).distinct().order_by(Product.vendor).yield_per(1000)
+        return [vendor for (vendor,) in result]
     
     def get_price_range(self, db: Session) -> Dict[str, Optional[Decimal]]:
         """Get the price range (min and max) of active products."""
@@ -320,7 +336,7 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
             db.func.min(Product.price).label('min_price'),
             db.func.max(Product.price).label('max_price')
         ).filter(
-            and__(Product.is_active == True, Product.is_deleted == False)
+            Product.is_active == True
         ).first()
         
         return {
@@ -330,13 +346,11 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     
     def create_with_slug(self, db: Session, *, obj_in: ProductCreate) -> Product:
         """Create product and auto-generate slug if not provided."""
-        import re
-        
         # Auto-generate slug if not provided
         if not obj_in.slug:
             # Create slug from name
-            slug_base = re.sub(r'[^a-zA-Z0-9\s-]', '', obj_in.name.lower())
-            slug_base = re.sub(r'\s+', '-', slug_base.strip())
+            slug_base = _SLUG_STRIP.sub('', obj_in.name.lower())
+            slug_base = _SLUG_SPACES.sub('-', slug_base.strip())
             
             # Check for existing slug and append number if needed
             slug = slug_base
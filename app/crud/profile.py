@@ -11,22 +11,19 @@ class CRUDProfile:
     def get(self, db: Session, id: UUID) -> Optional[Profile]:
         """Get profile by UUID."""
         return db.query(Profile).filter(
-            Profile.id == id, 
-            Profile.is_deleted == False
+            Profile.id == id
         ).first()
 
     def get_by_user_id(self, db: Session, *, user_id: UUID) -> Optional[Profile]:
         """Get profile by user ID."""
         return db.query(Profile).filter(
-            Profile.user_id == user_id,
-            Profile.is_deleted == False
+            Profile.user_id == user_id
         ).first()
 
     def get_public_profiles(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[Profile]:
         """Get all public profiles."""
         return db.query(Profile).filter(
-            Profile.is_profile_public == "public",
-            Profile.is_deleted == False
+            Profile.is_profile_public == "public"
         ).offset(skip).limit(limit).all()
 
     def get_multi(
@@ -34,8 +31,8 @@ class CRUDProfile:
     ) -> List[Profile]:
         """Get multiple profiles with pagination."""
         query = db.query(Profile)
-        if not include_deleted:
-            query = query.filter(Profile.is_deleted == False)
+        if include_deleted:
+            query = query.execution_options(include_deleted=True)
         return query.offset(skip).limit(limit).all()
 
     def create(self, db: Session, *, obj_in: ProfileCreate) -> Profile:
@@ -43,14 +40,13 @@ class CRUDProfile:
         # Convert schema to dict and handle defaults
         profile_data = obj_in.model_dump()
         profile_data.setdefault('is_profile_public', 'private')
-        profile_data.setdefault('show_email', 'false')
-        profile_data.setdefault('show_phone', 'false')
-        profile_data.setdefault('other_details', {})
+        profile_data.setdefault('show_email', False)
+        profile_data.setdefault('show_phone', False)
+        profile_data['other_details'] = profile_data.get('other_details') or {}
         
         db_obj = Profile(**profile_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def update(
@@ -67,8 +63,7 @@ class CRUDProfile:
             setattr(db_obj, field, value)
         
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def create_or_update(
@@ -93,14 +88,14 @@ class CRUDProfile:
 
     def remove(self, db: Session, *, id: UUID, soft_delete: bool = True) -> Optional[Profile]:
         """Remove profile by UUID (soft delete by default)."""
-        obj = db.query(Profile).filter(Profile.id == id).first()
+        obj = db.query(Profile).execution_options(include_deleted=True).filter(Profile.id == id).first()
         if obj:
             if soft_delete:
                 obj.is_deleted = True
                 db.add(obj)
             else:
                 db.delete(obj)
-            db.commit()
+            db.flush()
         return obj
 
     def search_profiles(
@@ -115,7 +110,6 @@ class CRUDProfile:
         search_term = f"%{query}%"
         return db.query(Profile).filter(
             Profile.is_profile_public == "public",
-            Profile.is_deleted == False,
             (
                 Profile.first_name.ilike(search_term) |
                 Profile.last_name.ilike(search_term) |
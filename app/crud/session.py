@@ -1,8 +1,10 @@
 import uuid
-from datetime import datetime, timezone
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Mapping, Optional, Sequence, Tuple
+from sqlalchemy import RowMapping, and_, bindparam, delete, func, or_, select, tuple_, update
 from sqlalchemy.orm import Session as DBSession
 from app.models.session import Session
+from app.models.user import User
 from app.schemas.session import SessionCreate, SessionUpdate
 
 
@@ -11,33 +13,47 @@ def get_current_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
+# Columns exposed by ``SessionInfo`` (no token hashes)
+_SESSION_INFO_COLUMNS = (
+    Session.id,
+    Session.user_id,
+    Session.device_info,
+    Session.ip_address,
+    Session.last_activity,
+    Session.created_date,
+    Session.is_active,
+    Session.expires_at,
+)
+
+
 class CRUDSession:
     """CRUD operations for Session model."""
 
     def get(self, db: DBSession, id: uuid.UUID) -> Optional[Session]:
         """Get session by UUID."""
         return db.query(Session).filter(
-            Session.id == id, 
-            Session.is_deleted == False
+            Session.id == id
         ).first()
 
-    def get_by_token_hash(self, db: DBSession, *, token_hash: str) -> Optional[Session]:
+    def get_by_token_hash(self, db: DBSession, *, token_hash: bytes) -> Optional[Session]:
         """Get session by token hash."""
-        return db.query(Session).filter(
-            Session.token_hash == token_hash,
-            Session.is_deleted == False,
-            Session.is_active == True,
-            Session.expires_at > get_current_utc()
-        ).first()
+        return db.execute(
+            select(Session).where(
+                Session.token_hash == token_hash,
+                Session.is_active == True,
+                Session.expires_at > get_current_utc()
+            ).limit(1)
+        ).scalars().first()
 
-    def get_by_refresh_token_hash(self, db: DBSession, *, refresh_token_hash: str) -> Optional[Session]:
+    def get_by_refresh_token_hash(self, db: DBSession, *, refresh_token_hash: bytes) -> Optional[Session]:
         """Get session by refresh token hash."""
-        return db.query(Session).filter(
-            Session.refresh_token_hash == refresh_token_hash,
-            Session.is_deleted == False,
-            Session.is_active == True,
-            Session.expires_at > get_current_utc()
-        ).first()
+        return db.execute(
+            select(Session).where(
+                Session.refresh_token_hash == refresh_token_hash,
+                Session.is_active == True,
+                Session.expires_at > get_current_utc()
+            ).limit(1)
+        ).scalars().first()
 
     def get_user_sessions(
         self, 
@@ -45,12 +61,17 @@ class CRUDSession:
         *, 
         user_id: uuid.UUID, 
         active_only: bool = True,
-        include_expired: bool = False
+        include_expired: bool = False,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        limit: Optional[int] = None
     ) -> List[Session]:
-        """Get all sessions for a user."""
+        """Get sessions for a user, newest activity first.
+
+        Pass the ``(last_activity, id)`` of the last row of a page as ``after``
+        to fetch the next page (keyset pagination).
+        """
         query = db.query(Session).filter(
-            Session.user_id == user_id,
-            Session.is_deleted == False
+            Session.user_id == user_id
         )
         
         if active_only:
@@ -59,17 +80,71 @@ class CRUDSession:
         if not include_expired:
             query = query.filter(Session.expires_at > get_current_utc())
         
-        return query.order_by(Session.last_activity.desc()).all()
+        if after is not None:
+            query = query.filter(tuple_(Session.last_activity, Session.id) < after)
+        
+        query = query.order_by(Session.last_activity.desc(), Session.id.desc())
+        
+        if limit is not None:
+            query = query.limit(limit)
+        
+        return query.all()
+
+    def get_user_sessions_info(
+        self,
+        db: DBSession,
+        *,
+        user_id: uuid.UUID,
+        active_only: bool = True
+    ) -> Sequence[RowMapping]:
+        """Get the non-sensitive columns of a user's unexpired sessions as mappings.
+
+        Selects only the ``SessionInfo`` columns, so no ORM objects are built.
+        """
+        stmt = select(*_SESSION_INFO_COLUMNS).where(
+            Session.user_id == user_id,
+            Session.expires_at > get_current_utc()
+        )
+        if active_only:
+            stmt = stmt.where(Session.is_active == True)
+        stmt = stmt.order_by(Session.last_activity.desc(), Session.id.desc())
+        return db.execute(stmt).mappings().all()
 
     def get_active_sessions_count(self, db: DBSession, *, user_id: uuid.UUID) -> int:
         """Get count of active sessions for a user."""
         return db.query(Session).filter(
             Session.user_id == user_id,
-            Session.is_deleted == False,
             Session.is_active == True,
             Session.expires_at > get_current_utc()
         ).count()
 
+    def user_exists_and_session_count(
+        self, db: DBSession, *, user_id: uuid.UUID
+    ) -> Tuple[bool, int]:
+        """Return whether the user exists and their active session count, in one query."""
+        active_count = (
+            select(func.count(Session.id))
+            .where(
+                Session.user_id == user_id,
+                Session.is_active == True,
+                Session.expires_at > get_current_utc()
+            )
+            .scalar_subquery()
+        )
+        user_exists = select(User.id).where(User.id == user_id).exists()
+        row = db.execute(select(user_exists, active_count)).one()
+        return bool(row[0]), row[1]
+
+    def has_active_session(self, db: DBSession, *, user_id: uuid.UUID) -> bool:
+        """Check whether a user has at least one active session."""
+        return db.query(
+            db.query(Session).filter(
+                Session.user_id == user_id,
+                Session.is_active == True,
+                Session.expires_at > get_current_utc()
+            ).exists()
+        ).scalar()
+
     def create(self, db: DBSession, *, obj_in: SessionCreate) -> Session:
         """Create new session."""
         db_obj = Session(
@@ -83,8 +158,7 @@ class CRUDSession:
             other_details=obj_in.other_details or {},
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def update(
@@ -101,26 +175,42 @@ class CRUDSession:
             setattr(db_obj, field, value)
         
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def update_last_activity(self, db: DBSession, *, session: Session) -> Session:
         """Update session's last activity timestamp."""
         session.last_activity = get_current_utc()
         db.add(session)
-        db.commit()
-        db.refresh(session)
+        db.flush()
         return session
 
+    def bulk_update_last_activity(
+        self, db: DBSession, *, activity: Mapping[uuid.UUID, datetime]
+    ) -> None:
+        """Write buffered ``last_activity`` timestamps in one executemany UPDATE.
+
+        A Core statement rather than an ORM bulk UPDATE, so sessions deleted
+        since their activity was buffered are skipped instead of failing the
+        whole batch.
+        """
+        if not activity:
+            return
+        table = Session.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("session_id"))
+            .values(last_activity=bindparam("activity_at")),
+            [{"session_id": session_id, "activity_at": ts} for session_id, ts in activity.items()]
+        )
+
     def deactivate_session(self, db: DBSession, *, session_id: uuid.UUID) -> Optional[Session]:
         """Deactivate a specific session."""
         session = self.get(db, id=session_id)
         if session:
             session.is_active = False
             db.add(session)
-            db.commit()
-            db.refresh(session)
+            db.flush()
         return session
 
     def deactivate_user_sessions(
@@ -142,31 +232,98 @@ class CRUDSession:
         
         count = query.count()
         query.update({"is_active": False})
-        db.commit()
+        db.flush()
         return count
 
+    def deactivate_oldest_user_sessions(
+        self,
+        db: DBSession,
+        *,
+        user_id: uuid.UUID,
+        count: int
+    ) -> int:
+        """Deactivate a user's ``count`` least recently active sessions.
+
+        One UPDATE ... WHERE id IN (SELECT ... LIMIT) statement; no rows are
+        loaded.
+        """
+        oldest = (
+            select(Session.id)
+            .where(
+                Session.user_id == user_id,
+                Session.is_deleted == False,
+                Session.is_active == True,
+                Session.expires_at > get_current_utc()
+            )
+            .order_by(Session.last_activity.asc(), Session.id.asc())
+            .limit(count)
+        )
+        result = db.execute(
+            update(Session)
+            .where(Session.id.in_(oldest))
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     def cleanup_expired_sessions(self, db: DBSession) -> int:
-        """Clean up expired sessions (soft delete)."""
-        expired_sessions = db.query(Session).filter(
-            Session.expires_at <= get_current_utc(),
-            Session.is_deleted == False
+        """Clean up expired sessions (soft delete) and return how many."""
+        result = db.execute(
+            update(Session)
+            .where(
+                Session.expires_at <= get_current_utc(),
+                Session.is_deleted == False
+            )
+            .values(is_deleted=True)
+            .execution_options(synchronize_session=False)
         )
-        
-        count = expired_sessions.count()
-        expired_sessions.update({"is_deleted": True})
-        db.commit()
-        return count
+        return result.rowcount
+
+    def purge_expired_sessions(
+        self,
+        db: DBSession,
+        *,
+        batch_size: int = 5000,
+        inactive_retention_days: int = 30
+    ) -> int:
+        """Permanently delete up to ``batch_size`` dead sessions; return how many.
+
+        Dead means expired, or revoked with no activity for
+        ``inactive_retention_days``. Call repeatedly, committing in between,
+        until it returns less than ``batch_size``; each batch holds its row
+        locks only briefly.
+        """
+        now = get_current_utc()
+        dead = (
+            select(Session.id)
+            .where(
+                or_(
+                    Session.expires_at <= now,
+                    and_(
+                        Session.is_active == False,
+                        Session.last_activity < now - timedelta(days=inactive_retention_days)
+                    )
+                )
+            )
+            .limit(batch_size)
+        )
+        result = db.execute(
+            delete(Session)
+            .where(Session.id.in_(dead))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     def remove(self, db: DBSession, *, id: uuid.UUID, soft_delete: bool = True) -> Optional[Session]:
         """Remove session by UUID (soft delete by default)."""
-        obj = db.query(Session).filter(Session.id == id).first()
+        obj = db.query(Session).execution_options(include_deleted=True).filter(Session.id == id).first()
         if obj:
             if soft_delete:
                 obj.is_deleted = True
                 db.add(obj)
             else:
                 db.delete(obj)
-            db.commit()
+            db.flush()
         return obj
 
 
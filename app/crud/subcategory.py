@@ -10,20 +10,19 @@ class CRUDSubcategory:
     
     def get(self, db: Session, id: uuid.UUID) -> Optional[Subcategory]:
         """Get subcategory by UUID."""
-        return db.query(Subcategory).filter(Subcategory.id == id, Subcategory.is_deleted == False).first()
+        return db.query(Subcategory).filter(Subcategory.id == id).first()
     
     def get_by_name(self, db: Session, *, name: str, category_id: uuid.UUID) -> Optional[Subcategory]:
         """Get subcategory by name within a category."""
         return db.query(Subcategory).filter(
             Subcategory.name == name,
-            Subcategory.category_id == category_id,
-            Subcategory.is_deleted == False
+            Subcategory.category_id == category_id
         ).first()
     
     def get_by_slug(self, db: Session, *, slug: str) -> Optional[Subcategory]:
         """Get subcategory by slug."""
         return db.query(Subcategory).filter(
-            Subcategory.slug == slug, Subcategory.is_deleted == False
+            Subcategory.slug == slug
         ).first()
     
     def get_by_category(
@@ -32,7 +31,7 @@ class CRUDSubcategory:
         """Get subcategories by category."""
         return (
             db.query(Subcategory)
-            .filter(Subcategory.category_id == category_id, Subcategory.is_deleted == False)
+            .filter(Subcategory.category_id == category_id)
             .order_by(Subcategory.display_order, Subcategory.name)
             .offset(skip)
             .limit(limit)
@@ -47,8 +46,7 @@ class CRUDSubcategory:
             db.query(Subcategory)
             .filter(
                 Subcategory.category_id == category_id,
-                Subcategory.is_active == True,
-                Subcategory.is_deleted == False
+                Subcategory.is_active == True
             )
             .order_by(Subcategory.display_order, Subcategory.name)
             .offset(skip)
@@ -62,7 +60,6 @@ class CRUDSubcategory:
         """Get multiple subcategories with pagination."""
         return (
             db.query(Subcategory)
-            .filter(Subcategory.is_deleted == False)
             .order_by(Subcategory.display_order, Subcategory.name)
             .offset(skip)
             .limit(limit)
@@ -84,8 +81,7 @@ class CRUDSubcategory:
             image_url=obj_in.image_url
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def update(
@@ -97,8 +93,7 @@ class CRUDSubcategory:
         for field, value in obj_data.items():
             setattr(db_obj, field, value)
         
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
     
     def remove(self, db: Session, *, id: uuid.UUID) -> Optional[Subcategory]:
@@ -106,7 +101,7 @@ class CRUDSubcategory:
         obj = self.get(db=db, id=id)
         if obj:
             obj.is_deleted = True
-            db.commit()
+            db.flush()
         return obj
 
 
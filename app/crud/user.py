@@ -1,9 +1,10 @@
 import uuid
-from typing import Any, Dict, List, Optional, Union
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple, Union
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session, selectinload
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import dummy_verify_password, get_password_hash, verify_password
 
 
 class CRUDUser:
@@ -11,23 +12,57 @@ class CRUDUser:
 
     def get(self, db: Session, id: uuid.UUID) -> Optional[User]:
         """Get user by UUID."""
-        return db.query(User).filter(User.id == id, User.is_deleted == False).first()
+        return db.query(User).filter(User.id == id).first()
 
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         """Get user by email."""
-        return db.query(User).filter(User.email == email, User.is_deleted == False).first()
+        return db.execute(select(User).where(User.email == email).limit(1)).scalars().first()
 
     def get_by_username(self, db: Session, *, username: str) -> Optional[User]:
         """Get user by username."""
-        return db.query(User).filter(User.username == username, User.is_deleted == False).first()
+        return db.execute(select(User).where(User.username == username).limit(1)).scalars().first()
+
+    def get_conflicting(
+        self, db: Session, *, username: str, email: str
+    ) -> Tuple[bool, bool]:
+        """Return whether ``username`` and ``email`` are taken, in one query.
+
+        Both flags are computed in SQL so they follow the columns'
+        case-insensitive collation, like the unique indexes do. Soft-deleted
+        users count too, since they still hold their unique values.
+        """
+        username_taken, email_taken = db.execute(
+            select(
+                func.max(case((User.username == username, 1), else_=0)),
+                func.max(case((User.email == email, 1), else_=0)),
+            )
+            .where(or_(User.username == username, User.email == email))
+            .execution_options(include_deleted=True)
+        ).one()
+        return bool(username_taken), bool(email_taken)
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100, include_deleted: bool = False
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        include_deleted: bool = False,
+        with_relationships: bool = False
     ) -> List[User]:
-        """Get multiple users with pagination."""
+        """Get multiple users with pagination.
+
+        ``with_relationships`` eager-loads ``user_type`` and ``addresses`` with
+        one extra SELECT each, instead of one lazy load per user.
+        """
         query = db.query(User)
-        if not include_deleted:
-            query = query.filter(User.is_deleted == False)
+        if with_relationships:
+            query = query.options(
+                selectinload(User.user_type),
+                selectinload(User.addresses)
+            )
+        if include_deleted:
+            query = query.execution_options(include_deleted=True)
         return query.offset(skip).limit(limit).all()
 
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
@@ -41,8 +76,7 @@ class CRUDUser:
             other_details=obj_in.other_details or {},
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def update(
@@ -67,26 +101,27 @@ class CRUDUser:
             setattr(db_obj, field, value)
         
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        db.flush()
         return db_obj
 
     def remove(self, db: Session, *, id: uuid.UUID, soft_delete: bool = True) -> Optional[User]:
         """Remove user by UUID (soft delete by default)."""
-        obj = db.query(User).filter(User.id == id).first()
+        obj = db.query(User).execution_options(include_deleted=True).filter(User.id == id).first()
         if obj:
             if soft_delete:
                 obj.is_deleted = True
                 db.add(obj)
             else:
                 db.delete(obj)
-            db.commit()
+            db.flush()
         return obj
 
     def authenticate(self, db: Session, *, username: str, password: str) -> Optional[User]:
         """Authenticate user."""
         user = self.get_by_username(db, username=username)
         if not user:
+            # Spend the same KDF time as a real check to avoid leaking which usernames exist
+            dummy_verify_password()
             return None
         if not user.is_active:
             return None
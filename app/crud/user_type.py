@@ -2,27 +2,167 @@
 CRUD operations for UserType model.
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import copy
+import time
+import uuid
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from sqlalchemy import event, inspect, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.crud.base import CRUDBase
 from app.models.user_type import UserType
 from app.schemas.user_type import UserTypeCreate, UserTypeUpdate
 
 
+def _insert_ignoring_conflicts(db: Session, model, *, index_elements: List[str]):
+    """Build an INSERT that skips rows conflicting on ``index_elements``."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return pg_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    if dialect == "sqlite":
+        return sqlite_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    return insert(model)
+
+
+ACTIVE_CACHE_TTL_SECONDS = 60
+
+# Session.info flag: this transaction has written user types
+_CHANGED_KEY = "user_types_changed"
+
+
 class CRUDUserType(CRUDBase[UserType, UserTypeCreate, UserTypeUpdate]):
     """CRUD operations for UserType."""
 
+    def __init__(self, model):
+        super().__init__(model)
+        # Process-local code -> id map; user types are a small lookup table.
+        self._code_cache: Dict[str, uuid.UUID] = {}
+        # (expires_at, read-only column values) of the active user types
+        self._active_cache: Optional[Tuple[float, Tuple[Mapping[str, Any], ...]]] = None
+        # Bumped on every clear, so a read racing a commit is not cached
+        self._active_generation = 0
+
     def get_by_code(self, db: Session, *, code: str) -> Optional[UserType]:
-        """Get user type by code."""
-        return db.query(UserType).filter(UserType.code == code).first()
+        """Get user type by code.
+
+        The id is cached per code, so repeat lookups resolve through
+        ``db.get`` and hit the session identity map instead of the database.
+        """
+        cached_id = self._code_cache.get(code)
+        if cached_id is not None:
+            obj = db.get(UserType, cached_id)
+            if obj is not None and obj.code == code:
+                return obj
+            self.invalidate_code(code)
+
+        obj = db.execute(
+            select(UserType).where(UserType.code == code).limit(1)
+        ).scalars().first()
+        if obj is not None:
+            self._code_cache[code] = obj.id
+        return obj
+
+    def invalidate_code(self, code: Optional[str] = None) -> None:
+        """Drop one cached code, or the whole cache when no code is given."""
+        if code is None:
+            self._code_cache.clear()
+        else:
+            self._code_cache.pop(code, None)
+
+    def clear_active_cache(self) -> None:
+        """Drop the cached active user types."""
+        self._active_generation += 1
+        self._active_cache = None
+
+    def _mark_changed(self, db: Session, code: Optional[str] = None) -> None:
+        """Record a user type write in ``db``'s transaction.
+
+        The code -> id entry is dropped now (hits are re-checked against the
+        row anyway); the active list is dropped once the transaction commits.
+        """
+        self.invalidate_code(code)
+        db.info[_CHANGED_KEY] = True
 
     def get_by_name(self, db: Session, *, name: str) -> Optional[UserType]:
         """Get user type by name."""
-        return db.query(UserType).filter(UserType.name == name).first()
+        return db.execute(
+            select(UserType).where(UserType.name == name).limit(1)
+        ).scalars().first()
 
     def get_active(self, db: Session) -> List[UserType]:
-        """Get all active user types."""
-        return db.query(UserType).filter(UserType.is_active == True).all()
+        """Get all active user types.
+
+        Copies of the committed column values are cached for
+        ``ACTIVE_CACHE_TTL_SECONDS``. On a hit, rows the session already holds
+        are returned as they are and the rest are attached without SQL. A
+        session with uncommitted user type writes always queries.
+        """
+        changed = db.info.get(_CHANGED_KEY, False)
+        cached = self._active_cache
+        if not changed and cached is not None and cached[0] > time.monotonic():
+            return [self._attach(db, values) for values in cached[1]]
+
+        generation = self._active_generation
+        objs = list(
+            db.execute(select(UserType).where(UserType.is_active == True)).scalars()
+        )
+        if not changed and generation == self._active_generation:
+            columns = [attr.key for attr in inspect(UserType).column_attrs]
+            self._active_cache = (
+                time.monotonic() + ACTIVE_CACHE_TTL_SECONDS,
+                tuple(
+                    MappingProxyType(
+                        {key: copy.deepcopy(getattr(obj, key)) for key in columns}
+                    )
+                    for obj in objs
+                ),
+            )
+        return objs
+
+    @staticmethod
+    def _attach(db: Session, values: Mapping[str, Any]) -> UserType:
+        """Return the session's instance for a cached row, or attach a copy."""
+        existing = db.identity_map.get(db.identity_key(UserType, values["id"]))
+        if existing is not None:
+            return existing
+        obj = UserType(**copy.deepcopy(dict(values)))
+        make_transient_to_detached(obj)
+        db.add(obj)
+        return obj
+
+    def create(self, db: Session, *, obj_in: UserTypeCreate) -> UserType:
+        """Create new user type."""
+        self._mark_changed(db, obj_in.code)
+        return super().create(db, obj_in=obj_in)
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: UserType,
+        obj_in: Union[UserTypeUpdate, Dict[str, Any]]
+    ) -> UserType:
+        """Update user type."""
+        self._mark_changed(db, db_obj.code)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        self._mark_changed(db, db_obj.code)
+        return db_obj
+
+    def remove(self, db: Session, *, id: uuid.UUID) -> Optional[UserType]:
+        """Permanently delete user type."""
+        obj = super().remove(db, id=id)
+        if obj:
+            self._mark_changed(db, obj.code)
+        return obj
+
+    def soft_delete(self, db: Session, *, id: uuid.UUID) -> Optional[UserType]:
+        """Soft delete user type."""
+        obj = super().soft_delete(db, id=id)
+        if obj:
+            self._mark_changed(db, obj.code)
+        return obj
 
     def create_if_not_exists(self, db: Session, *, obj_in: UserTypeCreate) -> UserType:
         """Create user type if it doesn't exist, otherwise return existing."""
@@ -31,14 +171,44 @@ class CRUDUserType(CRUDBase[UserType, UserTypeCreate, UserTypeUpdate]):
             return existing
         return self.create(db, obj_in=obj_in)
 
-    def bulk_create_if_not_exists(self, db: Session, *, user_types: List[dict]) -> List[UserType]:
-        """Bulk create user types if they don't exist."""
-        created_types = []
-        for user_type_data in user_types:
-            user_type_create = UserTypeCreate(**user_type_data)
-            user_type = self.create_if_not_exists(db, obj_in=user_type_create)
-            created_types.append(user_type)
-        return created_types
+    def bulk_create_if_not_exists(
+        self, db: Session, *, user_types: Sequence[Mapping[str, Any]]
+    ) -> List[UserType]:
+        """Bulk create user types if they don't exist.
 
+        Existing codes are found with one SELECT and the missing rows are
+        written with one INSERT, instead of a lookup and insert per row. The
+        dicts are passed straight to an executemany INSERT, which SQLAlchemy
+        batches into multi-row VALUES pages (``insertmanyvalues``).
+        """
+        codes = [row["code"] for row in user_types]
+
+        existing = set(
+            db.execute(select(UserType.code).where(UserType.code.in_(codes))).scalars()
+        )
+        to_insert = [row for row in user_types if row["code"] not in existing]
+        if to_insert:
+            db.execute(
+                _insert_ignoring_conflicts(db, UserType, index_elements=["code"]),
+                to_insert
+            )
+            db.info[_CHANGED_KEY] = True
+
+        return list(
+            db.execute(select(UserType).where(UserType.code.in_(codes))).scalars()
+        )
 
 user_type = CRUDUserType(UserType)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_active_user_types_after_commit(session: Session) -> None:
+    """Drop the active user type cache once a write to it is committed."""
+    if session.info.pop(_CHANGED_KEY, False):
+        user_type.clear_active_cache()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_user_type_writes(session: Session) -> None:
+    """Rolled-back user type writes leave the cache untouched."""
+    session.info.pop(_CHANGED_KEY, None)
@@ -1,62 +1,78 @@
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
-from sqlalchemy import Boolean, Column, DateTime, String, Text
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
-from sqlalchemy.types import TypeDecorator, VARCHAR
-from sqlalchemy.orm import declarative_base, declared_attr
-from sqlalchemy.engine import Dialect
-import json
+from typing import Dict, Any, List, Optional
+from sqlalchemy import JSON, Boolean, Column, DateTime, StatementLambdaElement, String, event, inspect, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import BINARY, TypeDecorator
+from sqlalchemy.orm import Session, declarative_base, declared_attr, with_loader_criteria
+from sqlalchemy.engine import Dialect, Engine
+
+
+class utc_clock(FunctionElement):
+    """Current timestamp at statement execution time.
+
+    Renders as ``clock_timestamp()`` on PostgreSQL, where ``now()`` is frozen
+    at transaction start and would give every row of a bulk insert the same
+    value; other dialects use ``CURRENT_TIMESTAMP``.
+    """
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(utc_clock)
+def _compile_utc_clock(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utc_clock, "postgresql")
+def _compile_utc_clock_postgresql(element, compiler, **kw) -> str:
+    return "clock_timestamp()"
 
 
 class GUID(TypeDecorator[uuid.UUID]):
     """Platform-independent GUID type.
-    Uses PostgreSQL's UUID type, otherwise uses CHAR(36), storing as stringified hex values.
+    Uses PostgreSQL's UUID type, otherwise uses BINARY(16), storing the raw 16 bytes.
     """
-    impl = VARCHAR
+    impl = BINARY
     cache_ok = True
     def load_dialect_impl(self, dialect: Dialect):
         if dialect.name == 'postgresql':
             return dialect.type_descriptor(UUID())
         else:
-            return dialect.type_descriptor(VARCHAR(36))
-            return dialect.type_descriptor(VARCHAR(36))
+            return dialect.type_descriptor(BINARY(16))
 
-    def process_bind_param(self, value: Optional[uuid.UUID], dialect) -> Optional[str]:
+    def process_bind_param(self, value: Optional[uuid.UUID], dialect) -> Optional[Any]:
         if value is None:
             return value
-        elif dialect.name == 'postgresql':
-            return str(value)
-        else:
-            if not isinstance(value, uuid.UUID):
-                return str(uuid.UUID(value))
-            else:
-                return str(value)
-
-    def process_result_value(self, value: Optional[str], dialect) -> Optional[uuid.UUID]:
-        if value is None:
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        if dialect.name == 'postgresql':
             return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
+        return value.bytes
+
+    def process_result_value(self, value: Optional[Any], dialect) -> Optional[uuid.UUID]:
+        if value is None or isinstance(value, uuid.UUID):
             return value
+        if isinstance(value, bytes):
+            return uuid.UUID(bytes=value)
+        return uuid.UUID(value)
 
 
 class JSONType(TypeDecorator[Dict[str, Any]]):
-    """JSON type that stores data as TEXT and converts to/from Python dict."""
-    impl = Text
+    """Platform-independent JSON type.
+    Uses PostgreSQL's JSONB type, otherwise the generic JSON type; the driver
+    or dialect handles serialization.
+    """
+    impl = JSON
     cache_ok = True
 
-    def process_bind_param(self, value: Optional[Dict[str, Any]], dialect) -> Optional[str]:
-        if value is not None:
-            value = json.dumps(value)
-        return value
-
-    def process_result_value(self, value, dialect):
-        if value is not None:
-            value = json.loads(value)
-        return value
+    def load_dialect_impl(self, dialect: Dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(JSONB())
+        else:
+            return dialect.type_descriptor(JSON())
 
 
 # Create the base class
@@ -67,12 +83,96 @@ class BaseModel(Base):
     """Base model with common fields for all database models."""
     
     __abstract__ = True
+    # Fetch server-generated created/updated dates in the INSERT/UPDATE itself
+    # (RETURNING where supported) instead of a follow-up SELECT.
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(GUID(), primary_key=True, default=uuid.uuid4, index=True)
-    created_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_date = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_date = Column(DateTime(timezone=True), server_default=utc_clock(), nullable=False)
+    updated_date = Column(DateTime(timezone=True), server_default=utc_clock(), onupdate=utc_clock(), nullable=False)
     other_details = Column(JSONType, default=dict, nullable=True)
     is_deleted = Column(Boolean, default=False, nullable=False)
 
     def __repr__(self):
         return f"<{self.__class__.__name__}(id={self.id})>"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_soft_deleted(execute_state) -> None:
+    """Hide soft-deleted rows from every ORM SELECT.
+
+    Pass ``execution_options(include_deleted=True)`` to a query to see them.
+    This covers SELECTs only; UPDATE and DELETE statements filter
+    ``is_deleted`` themselves. ``lambda_stmt`` queries on soft-deletable
+    models are rejected: the criteria can't be added to them without
+    freezing their bound parameters, and they would otherwise silently
+    include deleted rows.
+    """
+    if (
+        not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.execution_options.get("include_deleted", False)
+    ):
+        return
+    if isinstance(execute_state.statement, StatementLambdaElement):
+        mapper = execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, BaseModel):
+            raise TypeError(
+                f"lambda_stmt queries on {mapper.class_.__name__} bypass the "
+                "soft-delete filter; use select() instead"
+            )
+        return
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(
+            BaseModel,
+            lambda cls: cls.is_deleted == False,
+            include_aliases=True,
+        )
+    )
+
+
+def create_missing_tables(bind: Engine) -> List[str]:
+    """Create the tables of ``Base.metadata`` that don't exist yet.
+
+    Existing tables are reflected with one query, instead of ``create_all``'s
+    existence check per table. Returns the names of the created tables.
+    """
+    with bind.begin() as conn:
+        existing = set(inspect(conn).get_table_names())
+        missing = [table for table in Base.metadata.sorted_tables if table.name not in existing]
+        if missing:
+            Base.metadata.create_all(conn, tables=missing, checkfirst=False)
+    return [table.name for table in missing]
+
+
+def convert_legacy_guids(bind: Engine) -> int:
+    """Rewrite GUIDs stored as 36-character text as the raw 16 bytes.
+
+    Databases created before GUID switched to BINARY(16) hold text ids; this
+    converts every GUID column in one transaction. SQLite only, since
+    PostgreSQL keeps its native UUID column. Returns the number of converted
+    values and is a no-op once nothing is left to convert.
+    """
+    if bind.dialect.name != "sqlite":
+        return 0
+    quote = bind.dialect.identifier_preparer.quote
+    converted = 0
+    with bind.begin() as conn:
+        existing = set(inspect(conn).get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing:
+                continue
+            for column in table.columns:
+                if not isinstance(column.type, GUID):
+                    continue
+                t, c = quote(table.name), quote(column.name)
+                values = conn.execute(
+                    text(f"SELECT DISTINCT {c} FROM {t} WHERE typeof({c}) = 'text'")
+                ).scalars().all()
+                for value in values:
+                    conn.execute(
+                        text(f"UPDATE {t} SET {c} = :new WHERE {c} = :old"),
+                        {"new": uuid.UUID(value).bytes, "old": value},
+                    )
+                converted += len(values)
+    return converted
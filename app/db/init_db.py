@@ -1,5 +1,8 @@
+from functools import lru_cache
+from sqlalchemy import Boolean, Enum, insert, inspect, select, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
-from app.db.base import Base
+from app.db.base import create_missing_tables
 from app.db.session import engine
 from app.core.config import settings
 from app.core.security import get_password_hash
@@ -8,52 +11,122 @@ from app.models.user_type import UserType  # Import UserType model
 from app.models.profile import Profile  # Import to ensure table creation
 from app.models.address import Address  # Import to ensure table creation
 from app.models.session import Session as SessionModel  # Import to ensure table creation
-from app.models.department import Department  # Import to ensure table creation
-from app.models.category import Category  # Import to ensure table creation
-from app.models.subcategory import Subcategory  # Import to ensure table creation
-from app.models.product import Product  # Import to ensure table creation
 from app.crud.user_type import user_type
 from app.schemas.user_type import USER_TYPE_DEFAULTS
 from app.core.logging import logger
 
 
 def create_tables():
-    """Create database tables."""
-    Base.metadata.create_all(bind=engine)
+    """Create database tables that don't exist yet."""
+    create_missing_tables(engine)
+
+
+@lru_cache(maxsize=4)
+def _hash_bootstrap_password(password: str) -> str:
+    """Hash a bootstrap password, once per process (tests re-run bootstrap)."""
+    return get_password_hash(password)
+
+
+def is_db_initialized() -> bool:
+    """Check whether the schema has been created (cheap startup check)."""
+    with engine.connect() as conn:
+        return inspect(conn).has_table(User.__tablename__)
+
+
+def convert_legacy_profile_flags(bind: Engine) -> int:
+    """Convert profile privacy flags stored as text to the typed columns.
+
+    ``show_email``/``show_phone`` used to hold ``'true'``/``'false'`` strings,
+    which a Boolean column reads as True. SQLite rows are rewritten to 0/1.
+    PostgreSQL columns are altered to ``boolean`` and ``is_profile_public``
+    to the ``profile_visibility`` enum. Returns the number of converted
+    values; re-running is a no-op.
+    """
+    table = Profile.__tablename__
+    flags = ("show_email", "show_phone")
+    converted = 0
+    with bind.begin() as conn:
+        if not inspect(conn).has_table(table):
+            return 0
+        if bind.dialect.name == "sqlite":
+            for column in flags:
+                converted += conn.execute(text(
+                    f"UPDATE {table} SET {column} = "
+                    f"CASE WHEN lower({column}) IN ('true', '1') THEN 1 ELSE 0 END "
+                    f"WHERE typeof({column}) = 'text'"
+                )).rowcount
+            return converted
+        if bind.dialect.name != "postgresql":
+            return 0
+
+        types = {col["name"]: col["type"] for col in inspect(conn).get_columns(table)}
+        rows = conn.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+        for column in flags:
+            if not isinstance(types[column], Boolean):
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT, "
+                    f"ALTER COLUMN {column} TYPE boolean USING lower({column}) IN ('true', '1')"
+                ))
+                converted += rows
+        if not isinstance(types["is_profile_public"], Enum):
+            visibility = Profile.__table__.c.is_profile_public.type
+            visibility.create(conn, checkfirst=True)
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN is_profile_public DROP DEFAULT, "
+                f"ALTER COLUMN is_profile_public TYPE {visibility.name} "
+                f"USING is_profile_public::{visibility.name}"
+            ))
+            converted += rows
+    return converted
+
+
+def _acquire_bootstrap_lock(db: Session) -> None:
+    """Serialize concurrent bootstraps on PostgreSQL until the transaction ends."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext('bootstrap'))"))
 
 
 def create_default_user_types(db: Session) -> None:
     """Create default user types if they don't exist."""
     logger.info("Creating default user types...")
+    _acquire_bootstrap_lock(db)
     user_type.bulk_create_if_not_exists(db, user_types=USER_TYPE_DEFAULTS)
+    db.commit()
     logger.info("Default user types created!")
 
 
 def create_superuser(db: Session) -> None:
     """Create superuser if it doesn't exist."""
-    user = db.query(User).filter(
-        User.username == settings.FIRST_SUPERUSER_USERNAME,
-        User.is_deleted == False
-    ).first()
+    _acquire_bootstrap_lock(db)
+    # Only the id is needed to know whether the superuser exists. Soft-deleted
+    # rows count too, since they still hold the unique username.
+    existing_id = db.execute(
+        select(User.id)
+        .where(User.username == settings.FIRST_SUPERUSER_USERNAME)
+        .limit(1)
+        .execution_options(include_deleted=True)
+    ).scalar()
     
-    if not user:
+    if existing_id is None:
         # Get SUPER_ADMIN user type
         super_admin_type = user_type.get_by_code(db, code="SUPER_ADMIN")
         user_type_id = super_admin_type.id if super_admin_type else None
         
-        user = User(
-            username=settings.FIRST_SUPERUSER_USERNAME,
-            email=settings.FIRST_SUPERUSER_EMAIL,
-            hashed_password=get_password_hash(settings.FIRST_SUPERUSER_PASSWORD),
-            is_active=True,
-            is_superuser=True,
-            user_type_id=user_type_id,
-            other_details={"created_by": "system", "role": "initial_admin"}
-        )
-        db.add(user)
+        row = db.execute(
+            insert(User)
+            .values(
+                username=settings.FIRST_SUPERUSER_USERNAME,
+                email=settings.FIRST_SUPERUSER_EMAIL,
+                hashed_password=_hash_bootstrap_password(settings.FIRST_SUPERUSER_PASSWORD),
+                is_active=True,
+                is_superuser=True,
+                user_type_id=user_type_id,
+                other_details={"created_by": "system", "role": "initial_admin"}
+            )
+            .returning(User.id, User.username)
+        ).one()
         db.commit()
-        db.refresh(user)
-        logger.info(f"Superuser created: {settings.FIRST_SUPERUSER_USERNAME}")
+        logger.info(f"Superuser created: {row.username}")
     else:
         logger.info(f"Superuser already exists: {settings.FIRST_SUPERUSER_USERNAME}")
 
@@ -14,7 +14,16 @@ mongodb = MongoDB()
 async def connect_to_mongo():
     """Create MongoDB connection."""
     try:
-        mongodb.client = AsyncIOMotorClient(settings.get_mongodb_url())
+        # zlib is always available; pymongo drops zstd/snappy with a warning
+        # when their optional packages are not installed.
+        mongodb.client = AsyncIOMotorClient(
+            settings.get_mongodb_url(),
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            serverSelectionTimeoutMS=3000,
+            compressors="zstd,snappy,zlib",
+            uuidRepresentation="standard"
+        )
         mongodb.database = mongodb.client[settings.MONGODB_DATABASE]
         await mongodb.client.admin.command('ping')
         logger.info("Connected to MongoDB")
@@ -1,22 +1,41 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.core.config import settings
 
 # Configure engine based on database type
 database_url = settings.get_database_url()
 if "sqlite" in database_url:
     # SQLite specific configuration
+    sqlite_options = {}
+    if ":memory:" in database_url or database_url in ("sqlite://", "sqlite:///"):
+        # Every connection to :memory: is a new, empty database; share one.
+        sqlite_options["poolclass"] = StaticPool
     engine = create_engine(
         database_url,
         connect_args={"check_same_thread": False},
-        echo=False  # Set to True for SQL debugging
+        insertmanyvalues_page_size=1000,
+        echo=False,  # Set to True for SQL debugging
+        **sqlite_options
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Use WAL so readers are not blocked while a write is in progress."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
 else:
-    # PostgreSQL configuration
+    # PostgreSQL configuration: LIFO checkout keeps a small hot set of
+    # connections, and recycling replaces the per-checkout pre-ping.
     engine = create_engine(
         database_url,
-        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
         pool_recycle=300,
+        pool_use_lifo=True,
+        pool_pre_ping=False,
+        insertmanyvalues_page_size=1000,
         echo=False  # Set to True for SQL debugging
     )
 
@@ -24,9 +43,17 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def get_db():
-    """Database session dependency."""
+    """Database session dependency.
+
+    Each request runs in a single transaction: CRUD methods only flush, and
+    the session is committed once after the endpoint returns successfully.
+    """
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
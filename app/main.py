@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import AsyncGenerator
@@ -21,23 +22,55 @@ from app.core.advanced_logging import advanced_logger, business_logger
 from app.middleware.logging_middleware import LoggingMiddleware
 
 
+EXCEPTION_HANDLERS = (
+    (RequestValidationError, validation_exception_handler),
+    (ValidationError, pydantic_validation_exception_handler),
+    (HTTPException, http_exception_handler),
+    (IntegrityError, integrity_error_handler),
+    (Exception, general_exception_handler),
+)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager."""
     # Startup
-    from app.db.init_db import init_db
+    from app.db.init_db import is_db_initialized
     from app.core.advanced_logging import advanced_logger
+    from app.services.session_service import start_activity_flusher, stop_activity_flusher
+    
+    logger = advanced_logger.get_logger()
+    use_mongo = settings.database_type == "mongodb"
     
-    # Initialize database
-    init_db()
+    # Check the schema exists (and warm MongoDB concurrently when it is in use).
+    # Tables and seed data are created by `python -m app.cli init-db`.
+    if use_mongo:
+        from app.db.mongodb import connect_to_mongo
+        db_ready, _ = await asyncio.gather(
+            asyncio.to_thread(is_db_initialized), connect_to_mongo()
+        )
+    else:
+        db_ready = is_db_initialized()
+    
+    if not db_ready:
+        logger.error(
+            "Database is not initialized; run `python -m app.cli init-db`",
+            extra={"event": "startup"}
+        )
+        raise RuntimeError("Database is not initialized; run `python -m app.cli init-db`")
+    
+    start_activity_flusher()
     
     # Log application startup
-    logger = advanced_logger.get_logger()
     logger.info("FastAPI application starting up", extra={"event": "startup"})
     
     yield
     
-    # Shutdown - add any cleanup here if needed
+    # Shutdown
+    await asyncio.to_thread(stop_activity_flusher)
+    if use_mongo:
+        from app.db.mongodb import close_mongo_connection
+        await close_mongo_connection()
     logger.info("FastAPI application shutting down", extra={"event": "shutdown"})
 
 
@@ -78,11 +111,8 @@ def create_app() -> FastAPI:
     app.include_router(api_router)
 
     # Add exception handlers
-    app.add_exception_handler(RequestValidationError, validation_exception_handler)
-    app.add_exception_handler(ValidationError, pydantic_validation_exception_handler)
-    app.add_exception_handler(HTTPException, http_exception_handler)
-    app.add_exception_handler(IntegrityError, integrity_error_handler)
-    app.add_exception_handler(Exception, general_exception_handler)
+    for exc_class, handler in EXCEPTION_HANDLERS:
+        app.add_exception_handler(exc_class, handler)
 
     @app.get("/")
     async def root():
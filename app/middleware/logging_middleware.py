@@ -5,91 +5,89 @@ This middleware automatically logs all HTTP requests and responses with
 detailed information for monitoring and analysis.
 """
 
+import re
 import time
 import uuid
 from typing import Callable
 from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import json
 
 from app.core.advanced_logging import business_logger, app_logger
+from app.core.config import settings
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all HTTP requests and responses."""
+# Liveness probes hit these constantly; they are not worth a log record.
+SKIP_PATHS = frozenset({"/health", "/"})
+HEADER_LOG = settings.LOG_REQUEST_HEADERS
+
+
+class LoggingMiddleware:
+    """Middleware to log all HTTP requests and responses.
+
+    Implemented as plain ASGI middleware: it only watches the
+    ``http.response.start`` message for the status code, so responses are
+    streamed through without the task and body buffering of
+    ``BaseHTTPMiddleware``.
+    """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and log details."""
+        if scope["type"] != "http" or scope["path"] in SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
         # Generate unique request ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
         
         # Start timing
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Extract request details
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
-        method = request.method
-        url = str(request.url)
+        headers = Headers(scope=scope)
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        user_agent = headers.get("user-agent", "unknown")
+        method = scope["method"]
+        path = scope["path"]
+        query = scope.get("query_string", b"").decode("latin-1")
+        url = path + ("?" + query if query else "")
         
         # Log request start
-        app_logger.info(
-            f"Request started: {method} {url}",
-            extra={
-                "event_type": "request_start",
-                "request_id": request_id,
-                "method": method,
-                "url": url,
-                "client_ip": client_ip,
-                "user_agent": user_agent,
-                "headers": dict(request.headers)
-            }
-        )
+        start_extra = {
+            "event_type": "request_start",
+            "request_id": request_id,
+            "method": method,
+            "url": url,
+            "client_ip": client_ip,
+            "user_agent": user_agent
+        }
+        if HEADER_LOG:
+            start_extra["headers"] = dict(headers)
+        app_logger.info(f"Request started: {method} {url}", extra=start_extra)
+        
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
         
         # Process request
         try:
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Log successful response
-            app_logger.info(
-                f"Request completed: {method} {url}",
-                extra={
-                    "event_type": "request_completed",
-                    "request_id": request_id,
-                    "method": method,
-                    "url": url,
-                    "status_code": response.status_code,
-                    "duration_seconds": duration,
-                    "client_ip": client_ip
-                }
-            )
-            
-            # Log performance metrics
-            business_logger.api_performance(
-                endpoint=request.url.path,
-                method=method,
-                duration=duration,
-                status_code=response.status_code,
-                request_id=request_id,
-                client_ip=client_ip
-            )
-            
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Calculate duration for failed requests
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
             
             # Log error
             app_logger.error(
@@ -108,6 +106,33 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             
             # Re-raise the exception
             raise
+        
+        # Calculate duration
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        # Log successful response
+        app_logger.info(
+            f"Request completed: {method} {url}",
+            extra={
+                "event_type": "request_completed",
+                "request_id": request_id,
+                "method": method,
+                "url": url,
+                "status_code": status_code,
+                "duration_seconds": duration,
+                "client_ip": client_ip
+            }
+        )
+        
+        # Log performance metrics
+        business_logger.api_performance(
+            endpoint=path,
+            method=method,
+            duration=duration,
+            status_code=status_code,
+            request_id=request_id,
+            client_ip=client_ip
+        )
 
 
 class SecurityLoggingMiddleware(BaseHTTPMiddleware):
@@ -120,22 +145,28 @@ class SecurityLoggingMiddleware(BaseHTTPMiddleware):
             "<script>", "javascript:", "onload=", "onerror=",
             "../", "etc/passwd", "cmd.exe", "powershell"
         ]
+        # One case-insensitive alternation scans the URL for every pattern
+        # in a single pass.
+        self._suspicious_re = re.compile(
+            "|".join(re.escape(pattern) for pattern in self.suspicious_patterns),
+            re.IGNORECASE
+        )
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Check for security threats and log suspicious activity."""
         
         # Check for suspicious patterns in URL and query parameters
-        url_lower = str(request.url).lower()
-        is_suspicious = any(pattern in url_lower for pattern in self.suspicious_patterns)
+        url = str(request.url)
+        matches = self._suspicious_re.findall(url)
         
-        if is_suspicious:
+        if matches:
             business_logger.security_event(
                 "suspicious_request_pattern",
                 severity="medium",
-                url=str(request.url),
+                url=url,
                 client_ip=request.client.host if request.client else "unknown",
                 user_agent=request.headers.get("user-agent", "unknown"),
-                patterns_found=[p for p in self.suspicious_patterns if p in url_lower]
+                patterns_found=list(dict.fromkeys(match.lower() for match in matches))
             )
         
         # Check for unusual request sizes
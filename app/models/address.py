@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, Text, ForeignKey, Index
+from sqlalchemy import Boolean, Column, String, Text, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import BaseModel, GUID
 
@@ -48,6 +48,14 @@ class Address(BaseModel):
         Index("idx_address_user_id", "user_id"),
         Index("idx_address_user_default", "user_id", "is_default"),
         Index("idx_address_user_active", "user_id", "is_active"),
+        # At most one active default address per user
+        Index(
+            "idx_address_user_one_default",
+            "user_id",
+            unique=True,
+            postgresql_where=text("is_default AND is_active"),
+            sqlite_where=text("is_default AND is_active"),
+        ),
     )
     
     def __repr__(self) -> str:
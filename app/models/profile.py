@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Date, Integer
+from sqlalchemy import Boolean, Column, Enum, String, Text, Date, Integer
 from sqlalchemy.orm import relationship
 from app.db.base import BaseModel, GUID
 
@@ -27,9 +27,13 @@ class Profile(BaseModel):
     github_url = Column(String(255), nullable=True)
     
     # Privacy settings
-    is_profile_public = Column(String(10), default="private", nullable=False)  # public, private, friends
-    show_email = Column(String(10), default="false", nullable=False)  # true, false
-    show_phone = Column(String(10), default="false", nullable=False)  # true, false
+    is_profile_public = Column(
+        Enum("public", "private", "friends", name="profile_visibility"),
+        default="private",
+        nullable=False
+    )
+    show_email = Column(Boolean, default=False, nullable=False)
+    show_phone = Column(Boolean, default=False, nullable=False)
     
     # The following fields are inherited from BaseModel:
     # - id (UUID, primary key)
@@ -1,6 +1,5 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text
-from sqlalchemy.sql import func
-from app.db.base import BaseModel, GUID
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Index, LargeBinary, text
+from app.db.base import BaseModel, GUID, utc_clock
 
 
 class Session(BaseModel):
@@ -9,14 +8,33 @@ class Session(BaseModel):
     __tablename__ = "sessions"
 
     user_id = Column(GUID(), nullable=False, index=True)
-    token_hash = Column(String, nullable=False, unique=True, index=True)
-    refresh_token_hash = Column(String, nullable=True, unique=True, index=True)
+    # Raw SHA-256 digests (32 bytes), half the size of hex in rows and indexes
+    token_hash = Column(LargeBinary(32), nullable=False, unique=True, index=True)
+    refresh_token_hash = Column(LargeBinary(32), nullable=True, unique=True, index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     device_info = Column(Text, nullable=True)  # User agent, device type, etc.
     ip_address = Column(String, nullable=True)
     image_url = Column(String(500), nullable=True)  # Image attribute for sessions
-    last_activity = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    last_activity = Column(DateTime(timezone=True), server_default=utc_clock(), onupdate=utc_clock())
+    
+    # Covering partial indexes for session validation (PostgreSQL only): the
+    # token lookups filter on is_active/is_deleted/expires_at and are served
+    # by an index-only scan.
+    __table_args__ = (
+        Index(
+            "idx_session_active_token",
+            "token_hash",
+            postgresql_where=text("is_active AND NOT is_deleted"),
+            postgresql_include=["expires_at", "user_id"],
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_session_active_refresh_token",
+            "refresh_token_hash",
+            postgresql_where=text("is_active AND NOT is_deleted"),
+            postgresql_include=["expires_at", "user_id"],
+        ).ddl_if(dialect="postgresql"),
+    )
     
     # The following fields are inherited from BaseModel:
     # - id (UUID, primary key)
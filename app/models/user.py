@@ -1,6 +1,7 @@
-from sqlalchemy import Boolean, Column, String, ForeignKey
-from sqlalchemy.orm import relationship
-from app.db.base import BaseModel
+from sqlalchemy import DDL, Boolean, Column, String, ForeignKey, event, select
+from sqlalchemy.dialects.postgresql import CITEXT
+from sqlalchemy.orm import object_session, relationship
+from app.db.base import Base, BaseModel
 from app.db.base import GUID
 
 
@@ -9,8 +10,15 @@ class User(BaseModel):
     
     __tablename__ = "users"
 
-    username = Column(String, unique=True, index=True, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
+    # Case-insensitive: CITEXT on PostgreSQL, NOCASE collation elsewhere
+    username = Column(
+        String(64, collation="NOCASE").with_variant(CITEXT(), "postgresql"),
+        unique=True, index=True, nullable=False
+    )
+    email = Column(
+        String(255, collation="NOCASE").with_variant(CITEXT(), "postgresql"),
+        unique=True, index=True, nullable=False
+    )
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
@@ -27,8 +35,30 @@ class User(BaseModel):
     
     @property
     def default_address(self):
-        """Get the default address for this user."""
-        for address in self.addresses:
-            if address.is_default and address.is_active:
-                return address
-        return None
+        """Get the default address for this user.
+
+        Uses the ``addresses`` collection when it is already loaded, otherwise
+        fetches the single default row instead of loading every address.
+        """
+        session = object_session(self)
+        if "addresses" in self.__dict__ or session is None:
+            for address in self.addresses:
+                if address.is_default and address.is_active:
+                    return address
+            return None
+
+        from app.models.address import Address
+        return session.execute(
+            select(Address).where(
+                Address.user_id == self.id,
+                Address.is_default == True,
+                Address.is_active == True
+            ).limit(1)
+        ).scalars().first()
+
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS citext").execute_if(dialect="postgresql"),
+)
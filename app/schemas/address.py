@@ -1,9 +1,16 @@
-from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from typing import Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
 from uuid import UUID
 from app.schemas.base import BaseSchema
 
+AddressType = Literal["shipping", "billing", "both"]
+
+# Translation tables built once at import: phone validation keeps only the
+# digits, postal codes drop all whitespace.
+_PHONE_STRIP = str.maketrans('', '', ''.join(c for c in map(chr, range(128)) if not c.isdigit()))
+_POSTAL_STRIP = str.maketrans('', '', ' \t\n\r\x0b\x0c')
+
 
 class AddressBase(BaseModel):
     """Base address schema with common fields."""
@@ -23,23 +30,15 @@ class AddressBase(BaseModel):
     phone: Optional[str] = Field(None, max_length=20, description="Phone number for this address")
     email: Optional[str] = Field(None, max_length=255, description="Email for this address (optional)")
     
-    address_type: str = Field(default="shipping", description="Address type: shipping, billing, or both")
+    address_type: AddressType = Field(default="shipping", description="Address type: shipping, billing, or both")
     is_default: bool = Field(default=False, description="Whether this is the default address")
     delivery_instructions: Optional[str] = Field(None, description="Special delivery instructions")
     
-    @field_validator('address_type')
-    @classmethod
-    def validate_address_type(cls, v: str) -> str:
-        allowed_types = ['shipping', 'billing', 'both']
-        if v not in allowed_types:
-            raise ValueError(f'address_type must be one of: {", ".join(allowed_types)}')
-        return v
-    
     @field_validator('postal_code')
     @classmethod
     def validate_postal_code(cls, v: str) -> str:
-        # Basic validation - remove spaces and ensure it's not empty
-        cleaned = v.strip().replace(' ', '')
+        # Basic validation - remove whitespace and ensure it's not empty
+        cleaned = v.translate(_POSTAL_STRIP)
         if not cleaned:
             raise ValueError('postal_code cannot be empty')
         return cleaned
@@ -49,7 +48,7 @@ class AddressBase(BaseModel):
     def validate_phone(cls, v: Optional[str]) -> Optional[str]:
         if v:
             # Remove common phone formatting
-            cleaned = ''.join(filter(str.isdigit, v))
+            cleaned = v.translate(_PHONE_STRIP)
             if len(cleaned) < 10:
                 raise ValueError('phone must contain at least 10 digits')
         return v
@@ -62,6 +61,7 @@ class AddressCreate(AddressBase):
 
 class AddressUpdate(BaseModel):
     """Schema for updating an existing address."""
+    model_config = ConfigDict(defer_build=True)
     
     label: Optional[str] = Field(None, min_length=1, max_length=100)
     first_name: Optional[str] = Field(None, min_length=1, max_length=100)
@@ -78,23 +78,15 @@ class AddressUpdate(BaseModel):
     phone: Optional[str] = Field(None, max_length=20)
     email: Optional[str] = Field(None, max_length=255)
     
-    address_type: Optional[str] = Field(None)
+    address_type: Optional[AddressType] = Field(None)
     is_default: Optional[bool] = Field(None)
     is_active: Optional[bool] = Field(None)
     delivery_instructions: Optional[str] = Field(None)
-    
-    @field_validator('address_type')
-    @classmethod
-    def validate_address_type(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None:
-            allowed_types = ['shipping', 'billing', 'both']
-            if v not in allowed_types:
-                raise ValueError(f'address_type must be one of: {", ".join(allowed_types)}')
-        return v
 
 
 class AddressPublic(BaseSchema):
     """Public address schema for API responses."""
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
     
     id: UUID
     user_id: UUID
@@ -124,13 +116,11 @@ class AddressPublic(BaseSchema):
     # Computed fields
     full_name: str
     address_summary: str
-    
-    class Config:
-        from_attributes = True
 
 
 class AddressSummary(BaseModel):
     """Simplified address schema for lists and summaries."""
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
     
     id: UUID
     label: str
@@ -138,19 +128,18 @@ class AddressSummary(BaseModel):
     is_default: bool
     is_active: bool
     address_type: str
-    
-    class Config:
-        from_attributes = True
 
 
 class SetDefaultAddressRequest(BaseModel):
     """Schema for setting a default address."""
+    model_config = ConfigDict(frozen=True, defer_build=True)
     
     address_id: UUID = Field(..., description="ID of the address to set as default")
 
 
 class AddressResponse(BaseModel):
     """Response schema for address operations."""
+    model_config = ConfigDict(frozen=True, defer_build=True)
     
     success: bool
     message: str
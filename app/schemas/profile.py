@@ -1,32 +1,42 @@
 import uuid
 from datetime import date
-from typing import Optional, Any
+from typing import Annotated, Any, Literal, Optional
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from app.schemas.base import BaseSchema, BaseCreateSchema, BaseUpdateSchema
 
 
+ProfileVisibility = Literal["public", "private", "friends"]
+
+# Length-limited string types shared by ProfileBase/ProfileUpdate
+_Str20 = Annotated[str, Field(max_length=20)]
+_Str50 = Annotated[str, Field(max_length=50)]
+_Str100 = Annotated[str, Field(max_length=100)]
+_Str255 = Annotated[str, Field(max_length=255)]
+_Str1000 = Annotated[str, Field(max_length=1000)]
+
+
 class ProfileBase(BaseModel):
     """Base profile schema with core profile fields."""
-    first_name: Optional[str] = Field(None, max_length=50)
-    last_name: Optional[str] = Field(None, max_length=50)
-    phone_number: Optional[str] = Field(None, max_length=20)
+    first_name: Optional[_Str50] = None
+    last_name: Optional[_Str50] = None
+    phone_number: Optional[_Str20] = None
     date_of_birth: Optional[date] = None
-    bio: Optional[str] = Field(None, max_length=1000)
-    avatar_url: Optional[str] = Field(None, max_length=255)
-    location: Optional[str] = Field(None, max_length=100)
-    website: Optional[str] = Field(None, max_length=255)
-    company: Optional[str] = Field(None, max_length=100)
-    job_title: Optional[str] = Field(None, max_length=100)
+    bio: Optional[_Str1000] = None
+    avatar_url: Optional[_Str255] = None
+    location: Optional[_Str100] = None
+    website: Optional[_Str255] = None
+    company: Optional[_Str100] = None
+    job_title: Optional[_Str100] = None
     
     # Social media links
-    linkedin_url: Optional[str] = Field(None, max_length=255)
-    twitter_url: Optional[str] = Field(None, max_length=255)
-    github_url: Optional[str] = Field(None, max_length=255)
+    linkedin_url: Optional[_Str255] = None
+    twitter_url: Optional[_Str255] = None
+    github_url: Optional[_Str255] = None
     
     # Privacy settings
-    is_profile_public: Optional[str] = Field("private", pattern=r"^(public|private|friends)$")
-    show_email: Optional[str] = Field("false", pattern=r"^(true|false)$")
-    show_phone: Optional[str] = Field("false", pattern=r"^(true|false)$")
+    is_profile_public: Optional[ProfileVisibility] = "private"
+    show_email: Optional[bool] = False
+    show_phone: Optional[bool] = False
 
     @field_validator('website', 'linkedin_url', 'twitter_url', 'github_url', mode='before')
     @classmethod
@@ -39,44 +49,26 @@ class ProfileBase(BaseModel):
 class ProfileCreate(ProfileBase, BaseCreateSchema):
     """Schema for creating a profile."""
     user_id: uuid.UUID
-    
-    # Override base fields to make them optional for creation
-    first_name: Optional[str] = Field(None, max_length=50)
-    last_name: Optional[str] = Field(None, max_length=50)
-    phone_number: Optional[str] = Field(None, max_length=20)
-    date_of_birth: Optional[date] = None
-    bio: Optional[str] = Field(None, max_length=1000)
-    avatar_url: Optional[str] = Field(None, max_length=255)
-    location: Optional[str] = Field(None, max_length=100)
-    website: Optional[str] = Field(None, max_length=255)
-    company: Optional[str] = Field(None, max_length=100)
-    job_title: Optional[str] = Field(None, max_length=100)
-    linkedin_url: Optional[str] = Field(None, max_length=255)
-    twitter_url: Optional[str] = Field(None, max_length=255)
-    github_url: Optional[str] = Field(None, max_length=255)
-    is_profile_public: Optional[str] = Field("private", pattern=r"^(public|private|friends)$")
-    show_email: Optional[str] = Field("false", pattern=r"^(true|false)$")
-    show_phone: Optional[str] = Field("false", pattern=r"^(true|false)$")
 
 
 class ProfileUpdate(BaseUpdateSchema):
     """Schema for updating a profile."""
-    first_name: Optional[str] = Field(None, max_length=50)
-    last_name: Optional[str] = Field(None, max_length=50)
-    phone_number: Optional[str] = Field(None, max_length=20)
+    first_name: Optional[_Str50] = None
+    last_name: Optional[_Str50] = None
+    phone_number: Optional[_Str20] = None
     date_of_birth: Optional[date] = None
-    bio: Optional[str] = Field(None, max_length=1000)
-    avatar_url: Optional[str] = Field(None, max_length=255)
-    location: Optional[str] = Field(None, max_length=100)
-    website: Optional[str] = Field(None, max_length=255)
-    company: Optional[str] = Field(None, max_length=100)
-    job_title: Optional[str] = Field(None, max_length=100)
-    linkedin_url: Optional[str] = Field(None, max_length=255)
-    twitter_url: Optional[str] = Field(None, max_length=255)
-    github_url: Optional[str] = Field(None, max_length=255)
-    is_profile_public: Optional[str] = Field(None, pattern=r"^(public|private|friends)$")
-    show_email: Optional[str] = Field(None, pattern=r"^(true|false)$")
-    show_phone: Optional[str] = Field(None, pattern=r"^(true|false)$")
+    bio: Optional[_Str1000] = None
+    avatar_url: Optional[_Str255] = None
+    location: Optional[_Str100] = None
+    website: Optional[_Str255] = None
+    company: Optional[_Str100] = None
+    job_title: Optional[_Str100] = None
+    linkedin_url: Optional[_Str255] = None
+    twitter_url: Optional[_Str255] = None
+    github_url: Optional[_Str255] = None
+    is_profile_public: Optional[ProfileVisibility] = None
+    show_email: Optional[bool] = None
+    show_phone: Optional[bool] = None
 
 
 class Profile(ProfileBase, BaseSchema):
@@ -86,7 +78,7 @@ class Profile(ProfileBase, BaseSchema):
 
 class ProfileInDB(Profile):
     """Schema for profile in database."""
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class ProfilePublic(BaseModel):
@@ -109,7 +101,7 @@ class ProfilePublic(BaseModel):
 
 class ProfileWithUser(Profile):
     """Schema for profile with basic user information."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
     
     username: Optional[str] = None
     email: Optional[str] = None  # Only shown if show_email is true
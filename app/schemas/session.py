@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from app.schemas.base import BaseSchema, BaseCreateSchema, BaseUpdateSchema
 
 
@@ -16,8 +16,8 @@ class SessionBase(BaseModel):
 
 class SessionCreate(SessionBase, BaseCreateSchema):
     """Schema for creating a session."""
-    token_hash: str
-    refresh_token_hash: Optional[str] = None
+    token_hash: bytes
+    refresh_token_hash: Optional[bytes] = None
 
 
 class SessionUpdate(BaseUpdateSchema):
@@ -31,19 +31,20 @@ class SessionUpdate(BaseUpdateSchema):
 
 class Session(SessionBase, BaseSchema):
     """Schema for session response with all base fields."""
-    token_hash: str
-    refresh_token_hash: Optional[str] = None
+    token_hash: bytes
+    refresh_token_hash: Optional[bytes] = None
     last_activity: datetime
 
 
 class SessionInDB(Session):
     """Schema for session in database - same as Session for now."""
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 # Session management schemas
 class SessionInfo(BaseModel):
     """Schema for session information without sensitive data."""
+    model_config = ConfigDict(frozen=True)
     id: uuid.UUID
     user_id: uuid.UUID
     created_date: datetime
@@ -1,13 +1,17 @@
 from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from app.schemas.base import BaseSchema, BaseCreateSchema, BaseUpdateSchema
 
 
 class UserBase(BaseModel):
     """Base user schema with core user fields."""
+    # No length limits here: responses must serialize legacy rows that
+    # predate them. Input schemas enforce the column sizes.
     username: str
-    email: EmailStr
+    # Plain str here: responses are built from stored, already-validated rows.
+    # Input schemas redeclare it as EmailStr.
+    email: str
     is_active: Optional[bool] = True
     is_superuser: Optional[bool] = False
     user_type_id: Optional[UUID] = None
@@ -15,13 +19,15 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase, BaseCreateSchema):
     """Schema for creating a user."""
+    username: str = Field(..., max_length=64)
+    email: EmailStr = Field(..., max_length=255)
     password: str
 
 
 class UserUpdate(BaseUpdateSchema):
     """Schema for updating a user."""
-    username: Optional[str] = None
-    email: Optional[EmailStr] = None
+    username: Optional[str] = Field(None, max_length=64)
+    email: Optional[EmailStr] = Field(None, max_length=255)
     password: Optional[str] = None
     is_active: Optional[bool] = None
     is_superuser: Optional[bool] = None
@@ -41,16 +47,19 @@ class UserInDB(User):
 # Authentication schemas
 class Token(BaseModel):
     """Token schema."""
+    model_config = ConfigDict(frozen=True)
     access_token: str
     token_type: str
 
 
 class TokenPayload(BaseModel):
     """Token payload schema."""
+    model_config = ConfigDict(frozen=True)
     sub: Optional[str] = None
 
 
 class UserLogin(BaseModel):
     """User login schema."""
+    model_config = ConfigDict(frozen=True)
     username: str
     password: str
@@ -3,16 +3,14 @@ Extended user schemas that include relationships.
 This file handles schemas that require imports from other schema modules.
 """
 
-from typing import Optional, TYPE_CHECKING
+from typing import Optional
+from pydantic import ConfigDict
 from app.schemas.user import User as BaseUser
-
-if TYPE_CHECKING:
-    from app.schemas.user_type import UserType
+from app.schemas.user_type import UserType
 
 
 class UserWithType(BaseUser):
     """User schema that includes the user_type relationship."""
-    user_type: Optional["UserType"] = None
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
-    class Config:
-        from_attributes = True
+    user_type: Optional[UserType] = None
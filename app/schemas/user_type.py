@@ -2,7 +2,8 @@
 Pydantic schemas for UserType model.
 """
 
-from pydantic import BaseModel, Field
+from types import MappingProxyType
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
@@ -23,6 +24,8 @@ class UserTypeCreate(UserTypeBase):
 
 class UserTypeUpdate(BaseModel):
     """Schema for updating a user type."""
+    model_config = ConfigDict(defer_build=True)
+
     name: Optional[str] = Field(None, min_length=1, max_length=50)
     code: Optional[str] = Field(None, min_length=1, max_length=20)
     description: Optional[str] = None
@@ -31,13 +34,12 @@ class UserTypeUpdate(BaseModel):
 
 class UserTypeInDBBase(UserTypeBase):
     """Base schema for user types stored in database."""
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
     id: UUID
     created_date: datetime
     updated_date: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class UserType(UserTypeInDBBase):
     """Schema for returning user type data."""
@@ -49,7 +51,7 @@ class UserTypeInDB(UserTypeInDBBase):
     pass
 
 
-# Predefined user types
+# Predefined user types (read-only seed data)
 USER_TYPE_CODES = {
     "SUPER_ADMIN": "SUPER_ADMIN",
     "ADMIN": "ADMIN", 
@@ -58,35 +60,35 @@ USER_TYPE_CODES = {
     "USER": "USER"
 }
 
-USER_TYPE_DEFAULTS = [
-    {
+USER_TYPE_DEFAULTS = (
+    MappingProxyType({
         "name": "Super Administrator",
         "code": "SUPER_ADMIN",
         "description": "Super administrator with full system access and all permissions",
         "is_active": True
-    },
-    {
+    }),
+    MappingProxyType({
         "name": "Administrator", 
         "code": "ADMIN",
         "description": "Administrator with elevated permissions for system management",
         "is_active": True
-    },
-    {
+    }),
+    MappingProxyType({
         "name": "Human Resources",
         "code": "HR", 
         "description": "HR personnel with access to employee management and HR functions",
         "is_active": True
-    },
-    {
+    }),
+    MappingProxyType({
         "name": "Employee",
         "code": "EMPLOYEE",
         "description": "Regular employee with access to internal systems and resources",
         "is_active": True
-    },
-    {
+    }),
+    MappingProxyType({
         "name": "User",
         "code": "USER",
         "description": "Standard user with basic access permissions",
         "is_active": True
-    }
-]
+    }),
+)
@@ -4,7 +4,3 @@ Service layer for business logic.
 This package contains service classes that encapsulate business logic
 and provide a clean interface between API endpoints and data models.
 """
-
-from .product_service import ProductService
-
-__all__ = ["ProductService"]
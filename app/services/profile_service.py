@@ -10,6 +10,32 @@ from app.crud.profile import profile as profile_crud
 from app.crud.user import user as user_crud
 
 
+# Fields of ProfileWithUser that map straight onto Profile columns
+_PROFILE_COLUMNS = tuple(
+    name for name in ProfileWithUser.model_fields if name not in ("username", "email")
+)
+
+
+def _to_public_profile(profile: Profile) -> ProfilePublic:
+    """Build the validated public view of a profile row."""
+    return ProfilePublic.model_validate({
+        "id": profile.id,
+        "user_id": profile.user_id,
+        "first_name": profile.first_name,
+        "last_name": profile.last_name,
+        "bio": profile.bio,
+        "avatar_url": profile.avatar_url,
+        "location": profile.location,
+        "website": profile.website,
+        "company": profile.company,
+        "job_title": profile.job_title,
+        "linkedin_url": profile.linkedin_url,
+        "twitter_url": profile.twitter_url,
+        "github_url": profile.github_url,
+        "created_date": profile.created_date.date() if profile.created_date else None
+    })
+
+
 class ProfileService:
     """Service for managing user profiles."""
     
@@ -53,22 +79,7 @@ class ProfileService:
             return None
         
         # Convert to public profile schema
-        return ProfilePublic(
-            id=profile.id,
-            user_id=profile.user_id,
-            first_name=profile.first_name,
-            last_name=profile.last_name,
-            bio=profile.bio,
-            avatar_url=profile.avatar_url,
-            location=profile.location,
-            website=profile.website,
-            company=profile.company,
-            job_title=profile.job_title,
-            linkedin_url=profile.linkedin_url,
-            twitter_url=profile.twitter_url,
-            github_url=profile.github_url,
-            created_date=profile.created_date.date() if profile.created_date else None
-        )
+        return _to_public_profile(profile)
     
     def get_profile_with_user_info(
         self, 
@@ -90,17 +101,16 @@ class ProfileService:
         
         # Determine what information to show based on privacy settings
         email_to_show = None
-        if profile.show_email == "true" or requesting_user_id == user_id:
+        if profile.show_email or requesting_user_id == user_id:
             email_to_show = user.email
         
-        # Create the response
-        profile_data = ProfileWithUser(
-            **profile.__dict__,
-            username=user.username,
-            email=email_to_show
-        )
-        
-        return profile_data
+        # Copy only the schema's columns off the row; splatting __dict__ would
+        # also drag in SQLAlchemy instance state
+        return ProfileWithUser.model_validate({
+            **{name: getattr(profile, name) for name in _PROFILE_COLUMNS},
+            "username": user.username,
+            "email": email_to_show
+        })
     
     def search_public_profiles(
         self, 
@@ -118,27 +128,7 @@ class ProfileService:
             limit=limit
         )
         
-        public_profiles = []
-        for profile in profiles:
-            public_profile = ProfilePublic(
-                id=profile.id,
-                user_id=profile.user_id,
-                first_name=profile.first_name,
-                last_name=profile.last_name,
-                bio=profile.bio,
-                avatar_url=profile.avatar_url,
-                location=profile.location,
-                website=profile.website,
-                company=profile.company,
-                job_title=profile.job_title,
-                linkedin_url=profile.linkedin_url,
-                twitter_url=profile.twitter_url,
-                github_url=profile.github_url,
-                created_date=profile.created_date.date() if profile.created_date else None
-            )
-            public_profiles.append(public_profile)
-        
-        return public_profiles
+        return [_to_public_profile(profile) for profile in profiles]
     
     def delete_profile(
         self, 
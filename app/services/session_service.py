@@ -1,24 +1,166 @@
 import uuid
 import hashlib
 import secrets
+import threading
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session as DBSession
+from typing import Callable, Optional, List, Dict, Any, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session as DBSession, make_transient_to_detached
 from fastapi import HTTPException, status
 
 from app.models.session import Session
 from app.schemas.session import SessionCreate, SessionUpdate, SessionInfo, ActiveSessions
 from app.crud.session import session as session_crud
-from app.crud.user import user as user_crud
+from app.core.logging import logger
+
+
+_sha256 = hashlib.sha256
+
+SESSION_CACHE_TTL_SECONDS = 30
+SESSION_CACHE_MAX_SIZE = 10_000
+ACTIVITY_FLUSH_INTERVAL_SECONDS = 5
+
+# Process-local cache of validated sessions: token hash -> (monotonic
+# deadline, column values). Raw tokens are never stored. Request handlers
+# run in a thread pool, so every access holds _session_cache_lock.
+_session_cache: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
+_session_cache_lock = threading.Lock()
+_SESSION_COLUMNS = tuple(attr.key for attr in inspect(Session).column_attrs)
+
+# Pending last_activity writes: session id -> latest activity. Written as one
+# bulk UPDATE every ACTIVITY_FLUSH_INTERVAL_SECONDS by a background thread.
+_activity_buffer: Dict[uuid.UUID, datetime] = {}
+_activity_lock = threading.Lock()
+_stop_activity_flusher = threading.Event()
+_activity_flusher: Optional[threading.Thread] = None
+
+
+def _record_activity(session_id: uuid.UUID) -> None:
+    """Buffer a ``last_activity`` write for the next flush."""
+    now = datetime.now(timezone.utc)
+    with _activity_lock:
+        _activity_buffer[session_id] = now
+
+
+def flush_session_activity(session_factory: Optional[Callable[[], DBSession]] = None) -> int:
+    """Write buffered ``last_activity`` timestamps and return how many.
+
+    The write runs in its own session and transaction (``SessionLocal`` unless
+    ``session_factory`` is given), independent of any request. If it fails,
+    the timestamps go back into the buffer, behind any newer ones, and the
+    error is raised.
+    """
+    global _activity_buffer
+    with _activity_lock:
+        pending, _activity_buffer = _activity_buffer, {}
+    if not pending:
+        return 0
+
+    if session_factory is None:
+        from app.db.session import SessionLocal
+        session_factory = SessionLocal
+    db = session_factory()
+    try:
+        session_crud.bulk_update_last_activity(db, activity=pending)
+        db.commit()
+    except Exception:
+        db.rollback()
+        with _activity_lock:
+            for session_id, ts in pending.items():
+                _activity_buffer.setdefault(session_id, ts)
+        raise
+    finally:
+        db.close()
+    return len(pending)
+
+
+def _flush_activity_periodically() -> None:
+    while not _stop_activity_flusher.wait(ACTIVITY_FLUSH_INTERVAL_SECONDS):
+        try:
+            flush_session_activity()
+        except Exception as e:
+            logger.error(f"Error writing session activity: {e}")
+
+
+def start_activity_flusher() -> None:
+    """Start the background thread that flushes ``last_activity`` writes."""
+    global _activity_flusher
+    if _activity_flusher is not None and _activity_flusher.is_alive():
+        return
+    _stop_activity_flusher.clear()
+    _activity_flusher = threading.Thread(
+        target=_flush_activity_periodically, name="session-activity-flusher", daemon=True
+    )
+    _activity_flusher.start()
+
+
+def stop_activity_flusher() -> None:
+    """Stop the flusher thread and write whatever is still buffered."""
+    global _activity_flusher
+    _stop_activity_flusher.set()
+    if _activity_flusher is not None:
+        _activity_flusher.join()
+        _activity_flusher = None
+    flush_session_activity()
+
+
+def invalidate_cached_sessions(
+    *,
+    session_id: Optional[uuid.UUID] = None,
+    user_id: Optional[uuid.UUID] = None
+) -> None:
+    """Drop cached sessions by id or by user, or all of them if neither is given."""
+    with _session_cache_lock:
+        if session_id is None and user_id is None:
+            _session_cache.clear()
+            return
+        for token_hash, (_, values) in list(_session_cache.items()):
+            if values["id"] == session_id or values["user_id"] == user_id:
+                del _session_cache[token_hash]
+
+
+def invalidate_cached_sessions_on_commit(db: DBSession, *, user_id: uuid.UUID) -> None:
+    """Drop a user's cached sessions now and again once ``db`` commits.
+
+    The second drop discards sessions that other requests cached from the
+    pre-commit state in between (e.g. while a user is being deactivated).
+    """
+    invalidate_cached_sessions(user_id=user_id)
+    event.listen(
+        db, "after_commit", lambda _: invalidate_cached_sessions(user_id=user_id), once=True
+    )
+
+
+def _cache_session(token_hash: bytes, session: Session) -> None:
+    """Cache a validated session until the TTL or its own expiry, whichever is first."""
+    expires_at = session.expires_at
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    ttl = min(
+        SESSION_CACHE_TTL_SECONDS,
+        (expires_at - datetime.now(timezone.utc)).total_seconds()
+    )
+    if ttl <= 0:
+        return
+    entry = (
+        time.monotonic() + ttl,
+        {key: getattr(session, key) for key in _SESSION_COLUMNS},
+    )
+    with _session_cache_lock:
+        if token_hash not in _session_cache and len(_session_cache) >= SESSION_CACHE_MAX_SIZE:
+            # Evict the oldest insertion
+            del _session_cache[next(iter(_session_cache))]
+        _session_cache[token_hash] = entry
 
 
 class SessionService:
     """Service for managing user sessions."""
     
     @staticmethod
-    def create_token_hash(token: str) -> str:
-        """Create hash of a token for secure storage."""
-        return hashlib.sha256(token.encode()).hexdigest()
+    def create_token_hash(token: str) -> bytes:
+        """Create hash of a token for secure storage (raw 32-byte SHA-256 digest)."""
+        return _sha256(token.encode()).digest()
     
     @staticmethod
     def generate_session_token() -> str:
@@ -40,30 +182,26 @@ class SessionService:
     ) -> Session:
         """Create a new session for a user."""
         
-        # Check if user exists
-        user = user_crud.get(db, id=user_id)
-        if not user:
+        # Check the user exists and count their active sessions in one query
+        user_exists, active_sessions_count = session_crud.user_exists_and_session_count(
+            db, user_id=user_id
+        )
+        if not user_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
         # Cleanup old sessions if max sessions exceeded
-        active_sessions_count = session_crud.get_active_sessions_count(
-            db, user_id=user_id
-        )
-        
+
         if active_sessions_count >= max_sessions:
-            # Deactivate some old sessions to make room
-            sessions_to_deactivate = active_sessions_count - max_sessions + 1
-            user_sessions = session_crud.get_user_sessions(
-                db, user_id=user_id, active_only=True
+            # Deactivate the oldest sessions to make room
+            session_crud.deactivate_oldest_user_sessions(
+                db,
+                user_id=user_id,
+                count=active_sessions_count - max_sessions + 1
             )
-            
-            # Deactivate oldest sessions (assuming sessions are ordered by last_activity desc)
-            for i in range(sessions_to_deactivate):
-                if i < len(user_sessions):
-                    session_crud.deactivate_session(db, session_id=user_sessions[-(i+1)].id)
+            invalidate_cached_sessions(user_id=user_id)
         
         # Create token hashes
         token_hash = self.create_token_hash(access_token)
@@ -92,13 +230,32 @@ class SessionService:
         *, 
         access_token: str
     ) -> Optional[Session]:
-        """Validate an access token and return the session if valid."""
+        """Validate an access token and return the session if valid.
+        
+        Validated sessions are cached for ``SESSION_CACHE_TTL_SECONDS`` and
+        merged into ``db`` without SQL on a hit. ``last_activity`` is buffered
+        and written for all sessions at once by the activity flusher thread, so
+        the returned session's ``last_activity`` may lag by a few seconds.
+        """
         token_hash = self.create_token_hash(access_token)
-        session = session_crud.get_by_token_hash(db, token_hash=token_hash)
+        with _session_cache_lock:
+            cached = _session_cache.get(token_hash)
+            if cached is not None and cached[0] <= time.monotonic():
+                del _session_cache[token_hash]
+                cached = None
+        session = None
+        if cached is not None:
+            obj = Session(**cached[1])
+            make_transient_to_detached(obj)
+            session = db.merge(obj, load=False)
+        
+        if session is None:
+            session = session_crud.get_by_token_hash(db, token_hash=token_hash)
+            if session:
+                _cache_session(token_hash, session)
         
         if session:
-            # Update last activity
-            session_crud.update_last_activity(db, session=session)
+            _record_activity(session.id)
         
         return session
     
@@ -119,20 +276,22 @@ class SessionService:
         
         if not session:
             return None
+        invalidate_cached_sessions(session_id=session.id)
         
         # Update session with new tokens using direct database update
         new_token_hash = self.create_token_hash(new_access_token)
         new_refresh_token_hash = self.create_token_hash(new_refresh_token)
-        new_expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+        now = datetime.now(timezone.utc)
+        new_expires_at = now + timedelta(seconds=expires_in)
         
         # Use direct update to avoid SQLAlchemy assignment issues
         db.query(Session).filter(Session.id == session.id).update({
             "token_hash": new_token_hash,
             "refresh_token_hash": new_refresh_token_hash,
             "expires_at": new_expires_at,
-            "last_activity": datetime.now(timezone.utc)
+            "last_activity": now
         })
-        db.commit()
+        db.flush()
         db.refresh(session)
         
         return session
@@ -144,6 +303,7 @@ class SessionService:
         session_id: uuid.UUID
     ) -> bool:
         """Revoke (deactivate) a specific session."""
+        invalidate_cached_sessions(session_id=session_id)
         session = session_crud.deactivate_session(db, session_id=session_id)
         return session is not None
     
@@ -155,6 +315,7 @@ class SessionService:
         exclude_session_id: Optional[uuid.UUID] = None
     ) -> int:
         """Revoke all sessions for a user, optionally excluding one."""
+        invalidate_cached_sessions(user_id=user_id)
         return session_crud.deactivate_user_sessions(
             db, 
             user_id=user_id, 
@@ -169,25 +330,10 @@ class SessionService:
         active_only: bool = True
     ) -> List[SessionInfo]:
         """Get all sessions for a user."""
-        sessions = session_crud.get_user_sessions(
+        rows = session_crud.get_user_sessions_info(
             db, user_id=user_id, active_only=active_only
         )
-        
-        session_infos = []
-        for session in sessions:
-            session_info = SessionInfo(
-                id=session.id,
-                user_id=session.user_id,
-                device_info=session.device_info,
-                ip_address=session.ip_address,
-                last_activity=session.last_activity,
-                created_date=session.created_date,
-                is_active=session.is_active,
-                expires_at=session.expires_at
-            )
-            session_infos.append(session_info)
-        
-        return session_infos
+        return [SessionInfo.model_validate(row) for row in rows]
     
     def get_active_sessions_summary(
         self, 
@@ -195,26 +341,15 @@ class SessionService:
         *, 
         user_id: uuid.UUID
     ) -> ActiveSessions:
-        """Get summary of active sessions for a user."""
-        sessions = session_crud.get_user_sessions(
-            db, user_id=user_id, active_only=True
-        )
+        """Get summary of active sessions for a user.
         
-        session_infos = []
-        for session in sessions:
-            session_info = SessionInfo(
-                id=session.id,
-                device_info=session.device_info,
-                ip_address=session.ip_address,
-                last_activity=session.last_activity,
-                created_date=session.created_date,
-                is_active=session.is_active,
-                expires_at=session.expires_at
-            )
-            session_infos.append(session_info)
+        One query; the rows are unpaginated, so their count is the total.
+        """
+        session_infos = self.get_user_sessions(db, user_id=user_id, active_only=True)
         
         return ActiveSessions(
             total_count=len(session_infos),
+            active_count=len(session_infos),
             sessions=session_infos
         )
     
@@ -7,18 +7,22 @@ from sqlalchemy.orm import Session as DBSession
 from fastapi import HTTPException, status
 
 from app.models.session import Session
+from app.models.user import User
 from app.schemas.session import SessionCreate
 from app.crud.session import session as session_crud
-from app.crud.user import user as user_crud
+from app.services.session_service import invalidate_cached_sessions
+
+
+_sha256 = hashlib.sha256
 
 
 class SessionService:
     """Service for managing user sessions."""
     
     @staticmethod
-    def create_token_hash(token: str) -> str:
-        """Create hash of a token for secure storage."""
-        return hashlib.sha256(token.encode()).hexdigest()
+    def create_token_hash(token: str) -> bytes:
+        """Create hash of a token for secure storage (raw 32-byte SHA-256 digest)."""
+        return _sha256(token.encode()).digest()
     
     @staticmethod
     def generate_session_token() -> str:
@@ -39,9 +43,9 @@ class SessionService:
     ) -> Session:
         """Create a new session for a user."""
         
-        # Check if user exists
-        user = user_crud.get(db, id=user_id)
-        if not user:
+        # Check if user exists; callers usually hold the authenticated user,
+        # in which case this is an identity-map hit with no SQL.
+        if db.get(User, user_id) is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
@@ -85,6 +89,7 @@ class SessionService:
         session_id: uuid.UUID
     ) -> bool:
         """Revoke (deactivate) a specific session."""
+        invalidate_cached_sessions(session_id=session_id)
         session = session_crud.deactivate_session(db, session_id=session_id)
         return session is not None
     
@@ -96,6 +101,7 @@ class SessionService:
         exclude_session_id: Optional[uuid.UUID] = None
     ) -> int:
         """Revoke all sessions for a user, optionally excluding one."""
+        invalidate_cached_sessions(user_id=user_id)
         return session_crud.deactivate_user_sessions(
             db, 
             user_id=user_id, 
@@ -3,6 +3,7 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.crud.user import user as user_crud
+from app.services.session_service import invalidate_cached_sessions_on_commit
 from app.schemas.user import UserCreate, UserUpdate
 from app.models.user import User
 
@@ -12,17 +13,17 @@ class UserService:
 
     def create_user(self, db: Session, *, user_in: UserCreate) -> User:
         """Create new user with validation."""
-        # Check if user with username already exists
-        user_by_username = user_crud.get_by_username(db, username=user_in.username)
-        if user_by_username:
+        # Check username and email uniqueness in one query
+        username_taken, email_taken = user_crud.get_conflicting(
+            db, username=user_in.username, email=user_in.email
+        )
+        if username_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already registered"
             )
         
-        # Check if user with email already exists
-        user_by_email = user_crud.get_by_email(db, email=user_in.email)
-        if user_by_email:
+        if email_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
@@ -92,7 +93,11 @@ class UserService:
                     detail="Email already taken"
                 )
         
-        return user_crud.update(db, db_obj=user, obj_in=user_in)
+        user = user_crud.update(db, db_obj=user, obj_in=user_in)
+        if user_in.is_active is False:
+            # A deactivated user's cached sessions must not keep validating
+            invalidate_cached_sessions_on_commit(db, user_id=user_id)
+        return user
 
     def delete_user(self, db: Session, *, user_id: uuid.UUID, soft_delete: bool = True) -> bool:
         """Delete user by UUID (soft delete by default)."""
@@ -101,6 +106,7 @@ class UserService:
             return False
         
         user_crud.remove(db, id=user_id, soft_delete=soft_delete)
+        invalidate_cached_sessions_on_commit(db, user_id=user_id)
         return True
 
     def authenticate_user(self, db: Session, *, username: str, password: str) -> Optional[User]:
@@ -5,103 +5,189 @@ Provides comprehensive log analysis, alerting, and monitoring capabilities
 for tracking application performance, errors, and security events.
 """
 
+import heapq
 import os
-import json
 import statistics
-from collections import Counter, defaultdict
-from typing import Dict, Any, List, Optional
+from collections import defaultdict
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
+from sqlalchemy import func, or_, desc, lambda_stmt, select
 
 from app.core.advanced_logging import LogEntry
 from app.db.session import SessionLocal
 
+REPORT_CACHE_BUCKET_SECONDS = 300
+
+# (engine, report name, hours, time bucket) -> report. Reports are built
+# concurrently by the thread pools below, so access holds _report_cache_lock.
+_report_cache: Dict[Tuple[Engine, str, int, int], Dict[str, Any]] = {}
+_report_cache_lock = threading.Lock()
+
+
+def _cached_report(method: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+    """Cache a report per ``REPORT_CACHE_BUCKET_SECONDS`` wall-clock bucket.
+
+    Repeat calls (dashboards, the daily report) within a bucket reuse the
+    result; a new bucket is a new key, and entries of older buckets are
+    dropped when it is first filled. Reports are kept per engine, so
+    analyzers bound to different databases never share them.
+    """
+    @functools.wraps(method)
+    def wrapper(self, hours: int = 24) -> Dict[str, Any]:
+        bucket = int(time.time() // REPORT_CACHE_BUCKET_SECONDS)
+        key = (self.db.get_bind().engine, method.__name__, hours, bucket)
+        with _report_cache_lock:
+            report = _report_cache.get(key)
+        if report is None:
+            report = method(self, hours=hours)
+            with _report_cache_lock:
+                for stale in [k for k in _report_cache if k[3] != bucket]:
+                    del _report_cache[stale]
+                _report_cache[key] = report
+        return report
+    return wrapper
+
+
+def _hour_bucket(db: Session, column):
+    """SQL expression formatting ``column`` as ``YYYY-MM-DD HH:00``."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(func.date_trunc("hour", column), 'YYYY-MM-DD HH24:00')
+    return func.strftime("%Y-%m-%d %H:00", column)
+
+
+def _p95(values: List[float]) -> float:
+    """95th percentile (nearest rank) without sorting the whole list.
+    
+    Equivalent to ``sorted(values)[int(len(values) * 0.95)]``: that element is
+    the k-th largest, and ``heapq.nlargest`` only keeps a k-sized heap.
+    """
+    k = len(values) - int(len(values) * 0.95)
+    return heapq.nlargest(k, values)[-1]
+
 
 class LogAnalyzer:
-    """Comprehensive log analysis and monitoring tool."""
+    """Comprehensive log analysis and monitoring tool.
+    
+    Counts and groupings run in the database; only the aggregated rows and
+    the handful of recent entries shown in each report are fetched.
+    """
+    
+    # Rows fetched per round trip when samples are aggregated in Python
+    STREAM_BATCH_SIZE = 1000
     
     def __init__(self, db: Session):
         self.db = db
     
+    def _top_counts(self, column, *criteria, limit: int) -> Dict[Any, int]:
+        """Most frequent values of ``column`` among rows matching ``criteria``."""
+        count = func.count()
+        rows = self.db.execute(
+            select(column, count)
+            .where(*criteria)
+            .group_by(column)
+            .order_by(count.desc())
+            .limit(limit)
+        ).all()
+        return dict(rows)
+
+    def _top_counts_with_total(self, column, *criteria, limit: int) -> Tuple[Dict[Any, int], int]:
+        """``_top_counts`` plus the total row count, from the same query.
+
+        The total is a window sum over all groups, computed before the LIMIT.
+        """
+        count = func.count()
+        rows = self.db.execute(
+            select(column, count, func.sum(count).over())
+            .where(*criteria)
+            .group_by(column)
+            .order_by(count.desc())
+            .limit(limit)
+        ).all()
+        return {value: n for value, n, _ in rows}, int(rows[0][2]) if rows else 0
+    
+    def _counts(self, column, *criteria) -> Dict[Any, int]:
+        """Row counts per value of ``column`` among rows matching ``criteria``."""
+        rows = self.db.execute(
+            select(column, func.count()).where(*criteria).group_by(column)
+        ).all()
+        return dict(rows)
+    
+    def _timeline(self, *criteria) -> Dict[str, int]:
+        """Row counts per hour among rows matching ``criteria``."""
+        bucket = _hour_bucket(self.db, LogEntry.timestamp)
+        rows = self.db.execute(
+            select(bucket, func.count()).where(*criteria).group_by(bucket)
+        ).all()
+        return dict(rows)
+    
+    @_cached_report
     def get_error_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get error summary for the last N hours."""
         since = datetime.now(timezone.utc) - timedelta(hours=hours)
-        
-        # Query error logs from database
-        error_logs = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
-                    LogEntry.level.in_(["ERROR", "CRITICAL"]),
-                    LogEntry.timestamp >= since
-                )
-            )
-            .order_by(desc(LogEntry.timestamp))
-            .all()
+        criteria = (
+            LogEntry.level.in_(["ERROR", "CRITICAL"]),
+            LogEntry.timestamp >= since
         )
         
-        # Analyze errors
-        error_types = Counter()
-        error_modules = Counter()
-        error_timeline = defaultdict(int)
+        most_common_errors, total_errors = self._top_counts_with_total(
+            LogEntry.message, *criteria, limit=10
+        )
         
-        for log in error_logs:
-            error_types[log.message] += 1
-            error_modules[log.module] += 1
-            
-            # Group by hour for timeline
-            hour_key = log.timestamp.strftime("%Y-%m-%d %H:00")
-            error_timeline[hour_key] += 1
+        recent_errors = self.db.execute(
+            select(LogEntry.timestamp, LogEntry.message, LogEntry.module, LogEntry.function)
+            .where(*criteria)
+            .order_by(desc(LogEntry.timestamp))
+            .limit(20)
+        ).mappings().all()
         
         return {
-            "total_errors": len(error_logs),
+            "total_errors": total_errors,
             "time_period_hours": hours,
-            "most_common_errors": dict(error_types.most_common(10)),
-            "affected_modules": dict(error_modules.most_common(10)),
-            "error_timeline": dict(error_timeline),
+            "most_common_errors": most_common_errors,
+            "affected_modules": self._top_counts(LogEntry.module, *criteria, limit=10),
+            "error_timeline": self._timeline(*criteria),
             "recent_errors": [
                 {
-                    "timestamp": log.timestamp.isoformat(),
-                    "message": log.message,
-                    "module": log.module,
-                    "function": log.function
+                    "timestamp": log["timestamp"].isoformat(),
+                    "message": log["message"],
+                    "module": log["module"],
+                    "function": log["function"]
                 }
-                for log in error_logs[:20]
+                for log in recent_errors
             ]
         }
     
+    @_cached_report
     def get_performance_metrics(self, hours: int = 24) -> Dict[str, Any]:
         """Analyze API performance metrics."""
         # This would typically read from file logs or Elasticsearch
         # For now, we'll simulate with database data
         
-        since = datetime.utcnow() - timedelta(hours=hours)
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
         
-        # Get performance-related logs
-        perf_logs = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
-                    LogEntry.extra_data.contains("api_performance"),
-                    LogEntry.timestamp >= since
-                )
+        # The JSON fields come back already extracted and typed
+        perf_rows = self.db.execute(
+            select(
+                func.coalesce(LogEntry.extra_data["endpoint"].as_string(), "unknown"),
+                func.coalesce(LogEntry.extra_data["duration_ms"].as_float(), 0)
+            )
+            .where(
+                LogEntry.extra_data["event_type"].as_string() == "api_performance",
+                LogEntry.timestamp >= since
             )
-            .all()
+            .execution_options(yield_per=self.STREAM_BATCH_SIZE)
         )
         
         endpoint_stats = defaultdict(list)
         
-        for log in perf_logs:
-            if log.extra_data:
-                try:
-                    extra_data = json.loads(log.extra_data)
-                    if extra_data.get("event_type") == "api_performance":
-                        endpoint = extra_data.get("endpoint", "unknown")
-                        duration = extra_data.get("duration_ms", 0)
-                        endpoint_stats[endpoint].append(duration)
-                except json.JSONDecodeError:
-                    continue
+        for endpoint, duration in perf_rows:
+            endpoint_stats[endpoint].append(duration)
         
         # Calculate statistics
         performance_summary = {}
@@ -112,7 +198,7 @@ class LogAnalyzer:
                     "avg_response_time_ms": sum(durations) / len(durations),
                     "max_response_time_ms": max(durations),
                     "min_response_time_ms": min(durations),
-                    "p95_response_time_ms": sorted(durations)[int(len(durations) * 0.95)] if len(durations) > 1 else durations[0]
+                    "p95_response_time_ms": _p95(durations)
                 }
         
         return {
@@ -122,89 +208,85 @@ class LogAnalyzer:
             "performance_by_endpoint": performance_summary
         }
     
+    @_cached_report
     def get_security_alerts(self, hours: int = 24) -> Dict[str, Any]:
         """Get security-related alerts."""
-        since = datetime.utcnow() - timedelta(hours=hours)
-        
-        security_logs = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
-                    LogEntry.extra_data.contains("security_event"),
-                    LogEntry.timestamp >= since
-                )
-            )
-            .order_by(desc(LogEntry.timestamp))
-            .all()
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        criteria = (
+            LogEntry.extra_data["event_type"].as_string() == "security_event",
+            LogEntry.timestamp >= since
+        )
+        event_type = func.coalesce(
+            LogEntry.extra_data["security_event_type"].as_string(), "unknown"
         )
+        severity = func.coalesce(LogEntry.extra_data["severity"].as_string(), "unknown")
         
-        security_events = []
-        event_types = Counter()
-        severity_counts = Counter()
+        event_types = self._counts(event_type, *criteria)
         
-        for log in security_logs:
-            if log.extra_data:
-                try:
-                    extra_data = json.loads(log.extra_data)
-                    if extra_data.get("event_type") == "security_event":
-                        event_type = extra_data.get("security_event_type", "unknown")
-                        severity = extra_data.get("severity", "unknown")
-                        
-                        event_types[event_type] += 1
-                        severity_counts[severity] += 1
-                        
-                        security_events.append({
-                            "timestamp": log.timestamp.isoformat(),
-                            "event_type": event_type,
-                            "severity": severity,
-                            "message": log.message,
-                            "details": extra_data
-                        })
-                except json.JSONDecodeError:
-                    continue
+        recent_events = self.db.execute(
+            select(LogEntry.timestamp, LogEntry.message, LogEntry.extra_data)
+            .where(*criteria)
+            .order_by(desc(LogEntry.timestamp))
+            .limit(50)
+        ).all()
         
         return {
-            "total_security_events": len(security_events),
+            "total_security_events": sum(event_types.values()),
             "time_period_hours": hours,
-            "event_types": dict(event_types),
-            "severity_distribution": dict(severity_counts),
-            "recent_events": security_events[:50]
+            "event_types": event_types,
+            "severity_distribution": self._counts(severity, *criteria),
+            "recent_events": [
+                {
+                    "timestamp": timestamp.isoformat(),
+                    "event_type": extra_data.get("security_event_type", "unknown"),
+                    "severity": extra_data.get("severity", "unknown"),
+                    "message": message,
+                    "details": extra_data
+                }
+                for timestamp, message, extra_data in recent_events
+            ]
         }
     
+    @_cached_report
     def get_user_activity_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Analyze user activity patterns."""
-        since = datetime.utcnow() - timedelta(hours=hours)
-        
-        user_logs = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
-                    LogEntry.user_id.isnot(None),
-                    LogEntry.timestamp >= since
-                )
-            )
-            .all()
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        criteria = (
+            LogEntry.user_id.isnot(None),
+            LogEntry.timestamp >= since
         )
         
-        user_activity = defaultdict(int)
-        activity_timeline = defaultdict(int)
-        
-        for log in user_logs:
-            user_activity[log.user_id] += 1
-            
-            # Group by hour
-            hour_key = log.timestamp.strftime("%Y-%m-%d %H:00")
-            activity_timeline[hour_key] += 1
+        total_user_actions, unique_users = self.db.execute(
+            select(func.count(), func.count(LogEntry.user_id.distinct()))
+            .select_from(LogEntry)
+            .where(*criteria)
+        ).one()
         
         return {
-            "total_user_actions": len(user_logs),
-            "unique_users": len(user_activity),
+            "total_user_actions": total_user_actions,
+            "unique_users": unique_users,
             "time_period_hours": hours,
-            "most_active_users": dict(Counter(user_activity).most_common(20)),
-            "activity_timeline": dict(activity_timeline)
+            "most_active_users": self._top_counts(LogEntry.user_id, *criteria, limit=20),
+            "activity_timeline": self._timeline(*criteria)
         }
 
 
+def _run_reports(db: Session, hours: int, methods: List[str]) -> List[Dict[str, Any]]:
+    """Run independent ``LogAnalyzer`` reports concurrently.
+
+    A ``Session`` is not thread-safe, so each report gets its own session on
+    ``db``'s engine; the wall-clock cost is the slowest query, not the sum.
+    """
+    bind = db.get_bind()
+
+    def run(method: str) -> Dict[str, Any]:
+        with Session(bind) as report_db:
+            return getattr(LogAnalyzer(report_db), method)(hours=hours)
+
+    with ThreadPoolExecutor(max_workers=len(methods)) as pool:
+        return list(pool.map(run, methods))
+
+
 class LogMonitor:
     """Real-time log monitoring and alerting."""
     
@@ -218,18 +300,39 @@ class LogMonitor:
     
     def check_error_rate_alert(self, minutes: int = 5) -> Optional[Dict[str, Any]]:
         """Check if error rate exceeds threshold."""
-        since = datetime.utcnow() - timedelta(minutes=minutes)
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(minutes=minutes)
+        
+        # Cached statements: only ``since`` and ``cap`` are bound per probe.
+        # Counting stops at ``cap`` rows, so the usual no-alert case reads at
+        # most that many index entries; the full count runs only on alert.
+        cap = int(self.alert_thresholds["error_rate_per_minute"] * minutes) + 1
+        capped_count = self.db.execute(
+            lambda_stmt(
+                lambda: select(func.count()).select_from(
+                    select(LogEntry.id)
+                    .where(
+                        LogEntry.level.in_(["ERROR", "CRITICAL"]),
+                        LogEntry.timestamp >= since
+                    )
+                    .limit(cap)
+                    .subquery()
+                )
+            )
+        ).scalar_one()
+        if capped_count < cap:
+            return None
         
-        error_count = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
+        error_count = self.db.execute(
+            lambda_stmt(
+                lambda: select(func.count())
+                .select_from(LogEntry)
+                .where(
                     LogEntry.level.in_(["ERROR", "CRITICAL"]),
                     LogEntry.timestamp >= since
                 )
             )
-            .count()
-        )
+        ).scalar_one()
         
         error_rate = error_count / minutes
         
@@ -241,28 +344,29 @@ class LogMonitor:
                 "time_period_minutes": minutes,
                 "rate_per_minute": error_rate,
                 "threshold": self.alert_thresholds["error_rate_per_minute"],
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now.isoformat()
             }
         
         return None
     
     def check_security_alerts(self, minutes: int = 10) -> List[Dict[str, Any]]:
         """Check for security-related alerts."""
-        since = datetime.utcnow() - timedelta(minutes=minutes)
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(minutes=minutes)
         
         alerts = []
         
         # Check for multiple failed login attempts
-        failed_logins = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
-                    LogEntry.extra_data.contains("authentication_failure"),
+        failed_logins = self.db.execute(
+            lambda_stmt(
+                lambda: select(func.count())
+                .select_from(LogEntry)
+                .where(
+                    LogEntry.extra_data["security_event_type"].as_string() == "authentication_failure",
                     LogEntry.timestamp >= since
                 )
             )
-            .count()
-        )
+        ).scalar_one()
         
         if failed_logins > self.alert_thresholds["failed_login_attempts_per_minute"] * minutes:
             alerts.append({
@@ -272,20 +376,30 @@ class LogMonitor:
                 "time_period_minutes": minutes,
                 "rate_per_minute": failed_logins / minutes,
                 "threshold": self.alert_thresholds["failed_login_attempts_per_minute"],
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now.isoformat()
             })
         
         return alerts
     
     def generate_daily_report(self) -> Dict[str, Any]:
         """Generate comprehensive daily report."""
-        analyzer = LogAnalyzer(self.db)
+        now = datetime.now(timezone.utc)
+        errors, performance, security, activity = _run_reports(
+            self.db,
+            24,
+            [
+                "get_error_summary",
+                "get_performance_metrics",
+                "get_security_alerts",
+                "get_user_activity_summary",
+            ],
+        )
         
         return {
-            "report_date": datetime.utcnow().strftime("%Y-%m-%d"),
-            "generated_at": datetime.utcnow().isoformat(),
-            "error_summary": analyzer.get_error_summary(24),
-            "performance_metrics": analyzer.get_performance_metrics(24),
-            "security_summary": analyzer.get_security_alerts(24),
-            "user_activity": analyzer.get_user_activity_summary(24)
+            "report_date": now.strftime("%Y-%m-%d"),
+            "generated_at": now.isoformat(),
+            "error_summary": errors,
+            "performance_metrics": performance,
+            "security_summary": security,
+            "user_activity": activity
         }
@@ -5,17 +5,50 @@ Provides basic log analysis and monitoring capabilities
 for the FastAPI application with comprehensive logging.
 """
 
-import json
-import statistics
-from collections import Counter, defaultdict
-from typing import Dict, Any, List, Optional
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
+from sqlalchemy import case, func, or_, desc, lambda_stmt, select
 
 from app.core.advanced_logging import LogEntry
 from app.db.session import SessionLocal
 
+REPORT_CACHE_BUCKET_SECONDS = 300
+
+# (engine, report name, hours, time bucket) -> report. Reports are built
+# concurrently by the thread pools below, so access holds _report_cache_lock.
+_report_cache: Dict[Tuple[Engine, str, int, int], Dict[str, Any]] = {}
+_report_cache_lock = threading.Lock()
+
+
+def _cached_report(method: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+    """Cache a report per ``REPORT_CACHE_BUCKET_SECONDS`` wall-clock bucket.
+
+    Repeat calls (dashboards, the daily report) within a bucket reuse the
+    result; a new bucket is a new key, and entries of older buckets are
+    dropped when it is first filled. Reports are kept per engine, so
+    analyzers bound to different databases never share them.
+    """
+    @functools.wraps(method)
+    def wrapper(self, hours: int = 24) -> Dict[str, Any]:
+        bucket = int(time.time() // REPORT_CACHE_BUCKET_SECONDS)
+        key = (self.db.get_bind().engine, method.__name__, hours, bucket)
+        with _report_cache_lock:
+            report = _report_cache.get(key)
+        if report is None:
+            report = method(self, hours=hours)
+            with _report_cache_lock:
+                for stale in [k for k in _report_cache if k[3] != bucket]:
+                    del _report_cache[stale]
+                _report_cache[key] = report
+        return report
+    return wrapper
+
 
 class LogAnalyzer:
     """Analyze application logs for insights and patterns."""
@@ -23,24 +56,23 @@ class LogAnalyzer:
     def __init__(self, db: Session):
         self.db = db
     
+    @_cached_report
     def get_error_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get error summary for the last N hours."""
         since = datetime.now(timezone.utc) - timedelta(hours=hours)
         
-        # Query error logs from database
-        error_logs = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
-                    LogEntry.level.in_(["ERROR", "CRITICAL"]),
-                    LogEntry.timestamp >= since
-                )
-            )
-            .order_by(desc(LogEntry.timestamp))
-            .all()
+        criteria = (
+            LogEntry.level.in_(["ERROR", "CRITICAL"]),
+            LogEntry.timestamp >= since
+        )
+        # Use first 100 chars of message as error type; the same grouped
+        # query also yields the total
+        error_type = func.coalesce(func.nullif(func.substr(LogEntry.message, 1, 100), ""), "Unknown")
+        most_common_errors, total_errors = self._top_counts_with_total(
+            error_type, *criteria, limit=10
         )
         
-        if not error_logs:
+        if not total_errors:
             return {
                 "total_errors": 0,
                 "error_rate": 0.0,
@@ -49,64 +81,72 @@ class LogAnalyzer:
                 "period_hours": hours
             }
         
-        # Analyze errors
-        error_types: Counter[str] = Counter()
-        error_modules: Counter[str] = Counter()
-        
-        for log in error_logs:
-            # Use first 100 chars of message as error type
-            error_type = log.message[:100] if log.message else "Unknown"
-            error_types[error_type] += 1
-            
-            module = log.module if hasattr(log, 'module') and log.module else "unknown"
-            error_modules[module] += 1
+        module = func.coalesce(func.nullif(LogEntry.module, ""), "unknown")
         
         return {
-            "total_errors": len(error_logs),
-            "error_rate": round(len(error_logs) / hours, 2),
-            "most_common_errors": dict(error_types.most_common(10)),
-            "affected_modules": dict(error_modules.most_common(10)),
+            "total_errors": total_errors,
+            "error_rate": round(total_errors / hours, 2),
+            "most_common_errors": most_common_errors,
+            "affected_modules": self._top_counts(module, *criteria, limit=10),
             "period_hours": hours
         }
     
+    def _top_counts(self, column, *criteria, limit: int) -> Dict[Any, int]:
+        """Most frequent values of ``column`` among rows matching ``criteria``."""
+        count = func.count()
+        rows = self.db.execute(
+            select(column, count)
+            .where(*criteria)
+            .group_by(column)
+            .order_by(count.desc())
+            .limit(limit)
+        ).all()
+        return dict(rows)
+
+    def _top_counts_with_total(self, column, *criteria, limit: int) -> Tuple[Dict[Any, int], int]:
+        """``_top_counts`` plus the total row count, from the same query.
+
+        The total is a window sum over all groups, computed before the LIMIT.
+        """
+        count = func.count()
+        rows = self.db.execute(
+            select(column, count, func.sum(count).over())
+            .where(*criteria)
+            .group_by(column)
+            .order_by(count.desc())
+            .limit(limit)
+        ).all()
+        return {value: n for value, n, _ in rows}, int(rows[0][2]) if rows else 0
+    
+    @_cached_report
     def get_performance_metrics(self, hours: int = 24) -> Dict[str, Any]:
         """Analyze API performance metrics."""
         since = datetime.now(timezone.utc) - timedelta(hours=hours)
         
-        # Get all logs for performance analysis
-        logs = (
-            self.db.query(LogEntry)
-            .filter(LogEntry.timestamp >= since)
-            .all()
-        )
+        # Aggregate the typed duration_ms field in the database
+        duration = LogEntry.extra_data["duration_ms"].as_float()
+        log_count, request_count, avg_time, max_time, min_time = self.db.execute(
+            select(
+                func.count(),
+                func.count(duration),
+                func.avg(duration),
+                func.max(duration),
+                func.min(duration)
+            )
+            .select_from(LogEntry)
+            .where(LogEntry.timestamp >= since)
+        ).one()
         
-        if not logs:
+        if not log_count:
             return {
                 "total_requests": 0,
                 "avg_response_time": 0,
                 "period_hours": hours
             }
         
-        # Simple performance metrics
-        response_times = []
-        request_count = 0
-        
-        for log in logs:
-            if hasattr(log, 'extra_data') and log.extra_data:
-                try:
-                    # Convert extra_data to string if it's not already
-                    extra_str = str(log.extra_data) if not isinstance(log.extra_data, str) else log.extra_data
-                    extra_data = json.loads(extra_str)
-                    
-                    if "duration_ms" in extra_data:
-                        response_times.append(float(extra_data["duration_ms"]))
-                        request_count += 1
-                except (json.JSONDecodeError, ValueError, TypeError):
-                    continue
-        
-        if not response_times:
+        if not request_count:
             return {
-                "total_requests": len(logs),
+                "total_requests": log_count,
                 "avg_response_time": 0,
                 "max_response_time": 0,
                 "min_response_time": 0,
@@ -115,87 +155,86 @@ class LogAnalyzer:
         
         return {
             "total_requests": request_count,
-            "avg_response_time": round(statistics.mean(response_times), 2),
-            "max_response_time": round(max(response_times), 2),
-            "min_response_time": round(min(response_times), 2),
+            "avg_response_time": round(float(avg_time), 2),
+            "max_response_time": round(float(max_time), 2),
+            "min_response_time": round(float(min_time), 2),
             "period_hours": hours
         }
     
+    @_cached_report
     def get_security_alerts(self, hours: int = 24) -> Dict[str, Any]:
         """Analyze security events and generate alerts."""
         since = datetime.now(timezone.utc) - timedelta(hours=hours)
         
-        # Look for security-related log entries
-        security_logs = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
-                    LogEntry.timestamp >= since,
-                    or_(
-                        LogEntry.message.contains("security"),
-                        LogEntry.message.contains("unauthorized"),
-                        LogEntry.message.contains("forbidden"),
-                        LogEntry.message.contains("suspicious"),
-                        LogEntry.level == "WARNING"
-                    )
+        # Classify and count security-related log entries in the database
+        message = func.lower(LogEntry.message)
+        event_type = case(
+            (message.contains("unauthorized"), "unauthorized_access"),
+            (message.contains("forbidden"), "forbidden_access"),
+            (message.contains("suspicious"), "suspicious_activity"),
+            else_="unknown"
+        )
+        count = func.count()
+        security_events = self.db.execute(
+            select(event_type, count)
+            .where(
+                LogEntry.timestamp >= since,
+                or_(
+                    LogEntry.message.contains("security"),
+                    LogEntry.message.contains("unauthorized"),
+                    LogEntry.message.contains("forbidden"),
+                    LogEntry.message.contains("suspicious"),
+                    LogEntry.level == "WARNING"
                 )
             )
-            .all()
-        )
-        
-        security_events: Counter[str] = Counter()
-        for log in security_logs:
-            event_type = "unknown"
-            if "unauthorized" in log.message.lower():
-                event_type = "unauthorized_access"
-            elif "forbidden" in log.message.lower():
-                event_type = "forbidden_access"
-            elif "suspicious" in log.message.lower():
-                event_type = "suspicious_activity"
-            
-            security_events[event_type] += 1
+            .group_by(event_type)
+            .order_by(count.desc())
+        ).all()
         
         return {
-            "total_security_events": len(security_logs),
-            "event_types": dict(security_events.most_common()),
+            "total_security_events": sum(n for _, n in security_events),
+            "event_types": dict(security_events),
             "period_hours": hours
         }
     
+    @_cached_report
     def get_user_activity_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get user activity summary."""
         since = datetime.now(timezone.utc) - timedelta(hours=hours)
         
-        # Get logs with user information
-        user_logs = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
-                    LogEntry.timestamp >= since,
-                    LogEntry.user_id.isnot(None)
-                )
+        # Count actions and distinct users of logs with user information
+        total_user_actions, unique_users = self.db.execute(
+            select(func.count(), func.count(func.nullif(LogEntry.user_id, "").distinct()))
+            .select_from(LogEntry)
+            .where(
+                LogEntry.timestamp >= since,
+                LogEntry.user_id.isnot(None)
             )
-            .all()
-        )
-        
-        if not user_logs:
-            return {
-                "total_user_actions": 0,
-                "unique_users": 0,
-                "period_hours": hours
-            }
-        
-        unique_users = set()
-        for log in user_logs:
-            if hasattr(log, 'user_id') and log.user_id:
-                unique_users.add(str(log.user_id))
+        ).one()
         
         return {
-            "total_user_actions": len(user_logs),
-            "unique_users": len(unique_users),
+            "total_user_actions": total_user_actions,
+            "unique_users": unique_users,
             "period_hours": hours
         }
 
 
+def _run_reports(db: Session, hours: int, methods: List[str]) -> List[Dict[str, Any]]:
+    """Run independent ``LogAnalyzer`` reports concurrently.
+
+    A ``Session`` is not thread-safe, so each report gets its own session on
+    ``db``'s engine; the wall-clock cost is the slowest query, not the sum.
+    """
+    bind = db.get_bind()
+
+    def run(method: str) -> Dict[str, Any]:
+        with Session(bind) as report_db:
+            return getattr(LogAnalyzer(report_db), method)(hours=hours)
+
+    with ThreadPoolExecutor(max_workers=len(methods)) as pool:
+        return list(pool.map(run, methods))
+
+
 class LogMonitor:
     """Monitor logs for real-time alerts and anomalies."""
 
@@ -204,21 +243,43 @@ class LogMonitor:
     
     def check_error_rate_alert(self, minutes: int = 5) -> Optional[Dict[str, Any]]:
         """Check if error rate is above threshold."""
-        since = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(minutes=minutes)
         
-        error_count = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
+        # Alert if more than 10 errors in 5 minutes
+        threshold = 10
+        
+        # Cached statements: only ``since`` and ``cap`` are bound per probe.
+        # Counting stops at ``cap`` rows, so the usual no-alert case reads at
+        # most that many index entries; the full count runs only on alert.
+        cap = threshold + 1
+        capped_count = self.db.execute(
+            lambda_stmt(
+                lambda: select(func.count()).select_from(
+                    select(LogEntry.id)
+                    .where(
+                        LogEntry.timestamp >= since,
+                        LogEntry.level.in_(["ERROR", "CRITICAL"])
+                    )
+                    .limit(cap)
+                    .subquery()
+                )
+            )
+        ).scalar_one()
+        if capped_count < cap:
+            return None
+        
+        error_count = self.db.execute(
+            lambda_stmt(
+                lambda: select(func.count())
+                .select_from(LogEntry)
+                .where(
                     LogEntry.timestamp >= since,
                     LogEntry.level.in_(["ERROR", "CRITICAL"])
                 )
             )
-            .count()
-        )
+        ).scalar_one()
         
-        # Alert if more than 10 errors in 5 minutes
-        threshold = 10
         if error_count > threshold:
             return {
                 "alert_type": "high_error_rate",
@@ -226,28 +287,29 @@ class LogMonitor:
                 "error_count": error_count,
                 "threshold": threshold,
                 "time_window_minutes": minutes,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": now.isoformat()
             }
         
         return None
     
     def check_security_alerts(self, minutes: int = 10) -> List[Dict[str, Any]]:
         """Check for security-related alerts."""
-        since = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(minutes=minutes)
         
         alerts = []
         
         # Check for multiple failed authentication attempts
-        failed_auth_count = (
-            self.db.query(LogEntry)
-            .filter(
-                and_(
+        failed_auth_count = self.db.execute(
+            lambda_stmt(
+                lambda: select(func.count())
+                .select_from(LogEntry)
+                .where(
                     LogEntry.timestamp >= since,
                     LogEntry.message.contains("authentication failed")
                 )
             )
-            .count()
-        )
+        ).scalar_one()
         
         if failed_auth_count > 5:
             alerts.append({
@@ -255,20 +317,30 @@ class LogMonitor:
                 "severity": "warning",
                 "failed_attempts": failed_auth_count,
                 "time_window_minutes": minutes,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": now.isoformat()
             })
         
         return alerts
     
     def generate_daily_report(self) -> Dict[str, Any]:
         """Generate a comprehensive daily report."""
-        analyzer = LogAnalyzer(self.db)
+        now = datetime.now(timezone.utc)
+        errors, performance, security, activity = _run_reports(
+            self.db,
+            24,
+            [
+                "get_error_summary",
+                "get_performance_metrics",
+                "get_security_alerts",
+                "get_user_activity_summary",
+            ],
+        )
         
         return {
-            "report_date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "errors": analyzer.get_error_summary(hours=24),
-            "performance": analyzer.get_performance_metrics(hours=24),
-            "security": analyzer.get_security_alerts(hours=24),
-            "user_activity": analyzer.get_user_activity_summary(hours=24)
+            "report_date": now.strftime("%Y-%m-%d"),
+            "generated_at": now.isoformat(),
+            "errors": errors,
+            "performance": performance,
+            "security": security,
+            "user_activity": activity
         }
@@ -7,7 +7,7 @@ This script creates the database tables and optionally seeds initial data.
 import asyncio
 from sqlalchemy import text
 from app.db.session import engine
-from app.db.base import Base
+from app.db.base import create_missing_tables
 from app.core.config import settings
 from app.core.advanced_logging import advanced_logger
 
@@ -15,8 +15,8 @@ from app.core.advanced_logging import advanced_logger
 def create_database_tables():
     """Create all database tables."""
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Create the tables that don't exist yet
+        create_missing_tables(engine)
         print("✅ Database tables created successfully!")
         return True
     except Exception as e:
@@ -60,6 +60,7 @@ async def create_initial_superuser():
                 )
                 
                 user = user_crud.create(db, obj_in=user_in)
+                db.commit()
                 print(f"✅ Superuser created: {user.email}")
             else:
                 print(f"ℹ️  Superuser already exists: {existing_user.email}")
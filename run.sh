@@ -39,6 +39,13 @@ if [ "$ENVIRONMENT" = "production" ]; then
     fi
 fi
 
+# Initialize the database (idempotent: creates missing tables and default data)
+echo -e "${YELLOW}🗄️  Initializing database...${NC}"
+if ! python -m app.cli init-db; then
+    echo -e "${RED}❌ Database initialization failed. Check DATABASE_URL, then run: python -m app.cli init-db${NC}"
+    exit 1
+fi
+
 # Start the application
 echo -e "${GREEN}🏃 Starting FastAPI server...${NC}"
 echo -e "${YELLOW}📖 API Documentation will be available at: http://127.0.0.1:8000/docs${NC}"
@@ -16,10 +16,15 @@ def run_tests(
     verbose: bool = True,
     markers: Optional[str] = None,
     parallel: bool = False,
-    html_report: bool = False
-):
-    """Run tests with pytest."""
-    cmd = ["python", "-m", "pytest"]
+    html_report: bool = False,
+    use_subprocess: bool = False
+) -> int:
+    """Run tests with pytest and return its exit code.
+    
+    pytest runs in this interpreter unless ``use_subprocess`` is set, which
+    spawns a fresh ``python -m pytest`` for full isolation.
+    """
+    cmd = []
     
     # Add test path
     cmd.append(test_path)
@@ -43,9 +48,10 @@ def run_tests(
     if markers:
         cmd.extend(["-m", markers])
     
-    # Add parallel execution
+    # Add parallel execution; whole files go to one worker so module- and
+    # session-scoped fixtures are built once per worker rather than per test
     if parallel:
-        cmd.extend(["-n", "auto"])
+        cmd.extend(["-n", "auto", "--dist=loadfile"])
     
     # Add other useful options
     cmd.extend([
@@ -54,8 +60,15 @@ def run_tests(
         "--color=yes"
     ])
     
-    print(f"Running command: {' '.join(cmd)}")
-    return subprocess.run(cmd)
+    if use_subprocess:
+        cmd = ["python", "-m", "pytest", *cmd]
+        print(f"Running command: {' '.join(cmd)}")
+        return subprocess.run(cmd).returncode
+    
+    import pytest
+    
+    print(f"Running pytest {' '.join(cmd)}")
+    return int(pytest.main(cmd))
 
 
 def main():
@@ -98,6 +111,12 @@ def main():
         help="Generate HTML coverage report"
     )
     
+    parser.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="Run pytest in a separate interpreter instead of in-process"
+    )
+    
     args = parser.parse_args()
     
     # Run tests
@@ -107,10 +126,11 @@ def main():
         verbose=not args.quiet,
         markers=args.markers,
         parallel=args.parallel,
-        html_report=args.html_report
+        html_report=args.html_report,
+        use_subprocess=args.subprocess
     )
     
-    sys.exit(result.returncode)
+    sys.exit(result)
 
 
 if __name__ == "__main__":
@@ -8,7 +8,6 @@ initialization, migration, and switching between databases.
 
 import os
 import sys
-import subprocess
 from pathlib import Path
 
 # Add the project root to the path
@@ -17,14 +16,14 @@ sys.path.append(str(project_root))
 
 from app.core.config import settings
 from app.db.session import engine
-from app.db.base import Base
+from app.db.base import Base, create_missing_tables
 
 
 def create_tables():
     """Create all database tables."""
     try:
         print(f"Creating tables for database: {settings.get_database_url()}")
-        Base.metadata.create_all(bind=engine)
+        create_missing_tables(engine)
         print("✅ Tables created successfully!")
     except Exception as e:
         print(f"❌ Error creating tables: {e}")
@@ -114,31 +113,41 @@ def show_status():
 
 def run_migrations():
     """Run Alembic migrations."""
+    try:
+        from alembic import command
+        from alembic.config import Config
+        from alembic.util import CommandError
+    except ImportError:
+        print("❌ Alembic not found. Please install alembic: pip install alembic")
+        return False
+    
     try:
         print("🔄 Running database migrations...")
-        subprocess.run(["alembic", "upgrade", "head"], check=True)
+        command.upgrade(Config("alembic.ini"), "head")
         print("✅ Migrations completed successfully!")
-    except subprocess.CalledProcessError as e:
+    except CommandError as e:
         print(f"❌ Migration failed: {e}")
         return False
-    except FileNotFoundError:
-        print("❌ Alembic not found. Please install alembic: pip install alembic")
-        return False
     return True
 
 
 def create_migration(message: str):
     """Create a new Alembic migration."""
+    try:
+        from alembic import command
+        from alembic.config import Config
+        from alembic.util import CommandError
+    except ImportError:
+        print("❌ Alembic not found. Please install alembic: pip install alembic")
+        return False
+    
     try:
         print(f"📝 Creating migration: {message}")
-        subprocess.run(["alembic", "revision", "--autogenerate", "-m", message], check=True)
+        command.revision(Config("alembic.ini"), message=message, autogenerate=True)
         print("✅ Migration created successfully!")
-    except subprocess.CalledProcessError as e:
+    except CommandError as e:
         print(f"❌ Migration creation failed: {e}")
         return False
-    except FileNotFoundError:
-        print("❌ Alembic not found. Please install alembic: pip install alembic")
-        return False
     return True
 
 
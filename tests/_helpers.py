@@ -0,0 +1,22 @@
+"""
+Assertion helpers shared by the API tests.
+"""
+
+from typing import Any, Dict
+
+
+def assert_schema(data: Dict[str, Any], spec: Dict[str, type]) -> None:
+    """Assert ``data`` has every key in ``spec`` with a value of the given type.
+
+    Use ``object`` for keys whose presence is all that matters. Reports all
+    missing keys and type mismatches in one failure.
+    """
+    missing = spec.keys() - data.keys()
+    wrong_types = {
+        key: type(data[key]).__name__
+        for key, expected in spec.items()
+        if key in data and not isinstance(data[key], expected)
+    }
+    assert not missing and not wrong_types, (
+        f"missing keys: {sorted(missing)}, wrong types: {wrong_types}"
+    )
@@ -2,9 +2,13 @@
 Unit tests for address endpoints.
 """
 
+import pytest
 from fastapi.testclient import TestClient
 from typing import Dict, Any
-from uuid import uuid4
+
+
+# Well-formed id that never matches a row
+NONEXISTENT_ID = "00000000-0000-4000-8000-000000000000"
 
 
 class TestAddresses:
@@ -30,9 +34,18 @@ class TestAddresses:
         assert data["is_default"] is True  # First address should be default
         assert "id" in data
 
-    def test_create_address_unauthorized(self, client: TestClient, sample_address_data: Dict[str, Any]):
-        """Test creating address without authentication."""
-        response = client.post("/api/v1/addresses/", json=sample_address_data)
+    @pytest.mark.parametrize("method,url,kwargs", [
+        ("post", "/api/v1/addresses/", {"json": {"address_line_1": "123 Test St"}}),
+        ("get", "/api/v1/addresses/", {}),
+        ("get", f"/api/v1/addresses/{NONEXISTENT_ID}", {}),
+        ("put", f"/api/v1/addresses/{NONEXISTENT_ID}", {"json": {"address_line_1": "123 Test St"}}),
+        ("post", "/api/v1/addresses/set-default", {"json": {"address_id": NONEXISTENT_ID}}),
+        ("delete", f"/api/v1/addresses/{NONEXISTENT_ID}", {}),
+        ("get", "/api/v1/addresses/type/shipping", {}),
+    ])
+    def test_endpoint_requires_auth(self, client: TestClient, method: str, url: str, kwargs: Dict[str, Any]):
+        """Test address endpoints reject requests without authentication."""
+        response = client.request(method, url, **kwargs)
         assert response.status_code == 401
 
     def test_create_address_invalid_data(self, client: TestClient, auth_headers: Dict[str, str]):
@@ -44,12 +57,8 @@ class TestAddresses:
         response = client.post("/api/v1/addresses/", json=invalid_data, headers=auth_headers)
         assert response.status_code == 422
 
-    def test_get_user_addresses_with_data(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
+    def test_get_user_addresses_with_data(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any], created_address: Dict[str, Any]):
         """Test getting addresses when user has addresses."""
-        # Create an address first
-        response = client.post("/api/v1/addresses/", json=sample_address_data, headers=auth_headers)
-        assert response.status_code == 201
-        
         # Get addresses
         response = client.get("/api/v1/addresses/", headers=auth_headers)
         
@@ -70,8 +79,7 @@ class TestAddresses:
     def test_get_user_addresses_filter_by_type(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
         """Test filtering addresses by type."""
         # Create shipping address
-        shipping_data = sample_address_data.copy()
-        shipping_data["address_type"] = "shipping"
+        shipping_data = {**sample_address_data, "address_type": "shipping"}
         response = client.post("/api/v1/addresses/", json=shipping_data, headers=auth_headers)
         assert response.status_code == 201
         
@@ -84,11 +92,6 @@ class TestAddresses:
         for addr in data:
             assert addr["address_type"] == "shipping"
 
-    def test_get_user_addresses_unauthorized(self, client: TestClient):
-        """Test getting addresses without authentication."""
-        response = client.get("/api/v1/addresses/")
-        assert response.status_code == 401
-
     def test_get_default_address_none(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test getting default address when none exists."""
         response = client.get("/api/v1/addresses/default", headers=auth_headers)
@@ -97,12 +100,8 @@ class TestAddresses:
         # Should return null/None when no default address
         assert response.json() is None
 
-    def test_get_default_address_exists(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
+    def test_get_default_address_exists(self, client: TestClient, auth_headers: Dict[str, str], created_address: Dict[str, Any]):
         """Test getting default address when it exists."""
-        # Create an address (first one should be default)
-        response = client.post("/api/v1/addresses/", json=sample_address_data, headers=auth_headers)
-        assert response.status_code == 201
-        
         # Get default address
         response = client.get("/api/v1/addresses/default", headers=auth_headers)
         
@@ -111,12 +110,9 @@ class TestAddresses:
         assert data is not None
         assert data["is_default"] is True
 
-    def test_get_address_by_id_success(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
+    def test_get_address_by_id_success(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any], created_address: Dict[str, Any]):
         """Test getting specific address by ID."""
-        # Create an address
-        response = client.post("/api/v1/addresses/", json=sample_address_data, headers=auth_headers)
-        assert response.status_code == 201
-        address_id = response.json()["id"]
+        address_id = created_address["id"]
         
         # Get address by ID
         response = client.get(f"/api/v1/addresses/{address_id}", headers=auth_headers)
@@ -128,25 +124,16 @@ class TestAddresses:
 
     def test_get_address_by_id_not_found(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test getting non-existent address by ID."""
-        fake_id = str(uuid4())
+        fake_id = NONEXISTENT_ID
         response = client.get(f"/api/v1/addresses/{fake_id}", headers=auth_headers)
         
         assert response.status_code == 404
         data = response.json()
         assert data["detail"] == "Address not found"
 
-    def test_get_address_unauthorized(self, client: TestClient):
-        """Test getting address without authentication."""
-        fake_id = str(uuid4())
-        response = client.get(f"/api/v1/addresses/{fake_id}")
-        assert response.status_code == 401
-
-    def test_update_address_success(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
+    def test_update_address_success(self, client: TestClient, auth_headers: Dict[str, str], created_address: Dict[str, Any]):
         """Test updating an existing address."""
-        # Create an address
-        response = client.post("/api/v1/addresses/", json=sample_address_data, headers=auth_headers)
-        assert response.status_code == 201
-        address_id = response.json()["id"]
+        address_id = created_address["id"]
         
         # Update address
         update_data = {
@@ -162,7 +149,7 @@ class TestAddresses:
 
     def test_update_address_not_found(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test updating non-existent address."""
-        fake_id = str(uuid4())
+        fake_id = NONEXISTENT_ID
         update_data = {"address_line_1": "123 Test St"}
         response = client.put(f"/api/v1/addresses/{fake_id}", json=update_data, headers=auth_headers)
         
@@ -170,19 +157,9 @@ class TestAddresses:
         data = response.json()
         assert data["detail"] == "Address not found"
 
-    def test_update_address_unauthorized(self, client: TestClient):
-        """Test updating address without authentication."""
-        fake_id = str(uuid4())
-        update_data = {"address_line_1": "123 Test St"}
-        response = client.put(f"/api/v1/addresses/{fake_id}", json=update_data)
-        assert response.status_code == 401
-
-    def test_set_default_address_success(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
+    def test_set_default_address_success(self, client: TestClient, auth_headers: Dict[str, str], created_address: Dict[str, Any]):
         """Test setting an address as default."""
-        # Create an address
-        response = client.post("/api/v1/addresses/", json=sample_address_data, headers=auth_headers)
-        assert response.status_code == 201
-        address_id = response.json()["id"]
+        address_id = created_address["id"]
         
         # Set as default
         response = client.post("/api/v1/addresses/set-default", json={"address_id": address_id}, headers=auth_headers)
@@ -195,25 +172,16 @@ class TestAddresses:
 
     def test_set_default_address_not_found(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test setting non-existent address as default."""
-        fake_id = str(uuid4())
+        fake_id = NONEXISTENT_ID
         response = client.post("/api/v1/addresses/set-default", json={"address_id": fake_id}, headers=auth_headers)
         
         assert response.status_code == 404
         data = response.json()
         assert data["detail"] == "Address not found or inactive"
 
-    def test_set_default_address_unauthorized(self, client: TestClient):
-        """Test setting default address without authentication."""
-        fake_id = str(uuid4())
-        response = client.post("/api/v1/addresses/set-default", json={"address_id": fake_id})
-        assert response.status_code == 401
-
-    def test_delete_address_soft_delete(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
+    def test_delete_address_soft_delete(self, client: TestClient, auth_headers: Dict[str, str], created_address: Dict[str, Any]):
         """Test soft deleting an address."""
-        # Create an address
-        response = client.post("/api/v1/addresses/", json=sample_address_data, headers=auth_headers)
-        assert response.status_code == 201
-        address_id = response.json()["id"]
+        address_id = created_address["id"]
         
         # Soft delete address
         response = client.delete(f"/api/v1/addresses/{address_id}", headers=auth_headers)
@@ -223,12 +191,9 @@ class TestAddresses:
         assert data["success"] is True
         assert "deactivated" in data["message"]
 
-    def test_delete_address_hard_delete(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
+    def test_delete_address_hard_delete(self, client: TestClient, auth_headers: Dict[str, str], created_address: Dict[str, Any]):
         """Test hard deleting an address."""
-        # Create an address
-        response = client.post("/api/v1/addresses/", json=sample_address_data, headers=auth_headers)
-        assert response.status_code == 201
-        address_id = response.json()["id"]
+        address_id = created_address["id"]
         
         # Hard delete address
         response = client.delete(f"/api/v1/addresses/{address_id}?hard_delete=true", headers=auth_headers)
@@ -240,30 +205,21 @@ class TestAddresses:
 
     def test_delete_address_not_found(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test deleting non-existent address."""
-        fake_id = str(uuid4())
+        fake_id = NONEXISTENT_ID
         response = client.delete(f"/api/v1/addresses/{fake_id}", headers=auth_headers)
         
         assert response.status_code == 404
         data = response.json()
         assert data["detail"] == "Address not found"
 
-    def test_delete_address_unauthorized(self, client: TestClient):
-        """Test deleting address without authentication."""
-        fake_id = str(uuid4())
-        response = client.delete(f"/api/v1/addresses/{fake_id}")
-        assert response.status_code == 401
-
     def test_get_addresses_by_type_success(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
         """Test getting addresses by specific type."""
         # Create different types of addresses
-        shipping_data = sample_address_data.copy()
-        shipping_data["address_type"] = "shipping"
+        shipping_data = {**sample_address_data, "address_type": "shipping"}
         response = client.post("/api/v1/addresses/", json=shipping_data, headers=auth_headers)
         assert response.status_code == 201
         
-        billing_data = sample_address_data.copy()
-        billing_data["address_type"] = "billing"
-        billing_data["address_line_1"] = "789 Billing St"
+        billing_data = {**sample_address_data, "address_type": "billing", "address_line_1": "789 Billing St"}
         response = client.post("/api/v1/addresses/", json=billing_data, headers=auth_headers)
         assert response.status_code == 201
         
@@ -284,11 +240,6 @@ class TestAddresses:
         data = response.json()
         assert "address_type must be one of" in data["detail"]
 
-    def test_get_addresses_by_type_unauthorized(self, client: TestClient):
-        """Test getting addresses by type without authentication."""
-        response = client.get("/api/v1/addresses/type/shipping")
-        assert response.status_code == 401
-
     def test_multiple_addresses_default_management(self, client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]):
         """Test that only one address can be default at a time."""
         # Create first address (should be default)
@@ -297,8 +248,7 @@ class TestAddresses:
         first_address_id = response.json()["id"]
         
         # Create second address
-        second_address_data = sample_address_data.copy()
-        second_address_data["address_line_1"] = "456 Second St"
+        second_address_data = {**sample_address_data, "address_line_1": "456 Second St"}
         response = client.post("/api/v1/addresses/", json=second_address_data, headers=auth_headers)
         assert response.status_code == 201
         second_address_id = response.json()["id"]
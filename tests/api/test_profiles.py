@@ -2,11 +2,14 @@
 Unit tests for profile endpoints.
 """
 
+import pytest
 from fastapi.testclient import TestClient
 from typing import Dict, Any
-from uuid import uuid4
-import tempfile
-import os
+from tests._helpers import assert_schema
+
+
+# Well-formed id that never matches a row
+NONEXISTENT_ID = "00000000-0000-4000-8000-000000000000"
 
 
 class TestProfiles:
@@ -66,19 +69,21 @@ class TestProfiles:
         assert "profile_data" in data
         assert data["profile_data"]["first_name"] == sample_profile_data["first_name"]
 
-    def test_create_profile_unauthorized(self, client: TestClient, sample_profile_data: Dict[str, Any]):
-        """Test creating profile without authentication."""
-        response = client.post("/api/v1/profiles/", json=sample_profile_data)
-        assert response.status_code == 401
-
-    def test_get_my_profile_unauthorized(self, client: TestClient):
-        """Test getting profile without authentication."""
-        response = client.get("/api/v1/profiles/me")
+    @pytest.mark.parametrize("method,url,kwargs", [
+        ("post", "/api/v1/profiles/", {"json": {"first_name": "John"}}),
+        ("get", "/api/v1/profiles/me", {}),
+        ("delete", "/api/v1/profiles/", {}),
+        ("post", "/api/v1/profiles/upload-avatar", {"files": {"file": ("avatar.jpg", b"dummy image content", "image/jpeg")}}),
+        ("delete", "/api/v1/profiles/avatar", {}),
+    ])
+    def test_endpoint_requires_auth(self, client: TestClient, method: str, url: str, kwargs: Dict[str, Any]):
+        """Test profile endpoints reject requests without authentication."""
+        response = client.request(method, url, **kwargs)
         assert response.status_code == 401
 
     def test_get_user_profile_not_found(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test getting profile for non-existent user."""
-        fake_user_id = str(uuid4())
+        fake_user_id = NONEXISTENT_ID
         response = client.get(f"/api/v1/profiles/user/{fake_user_id}", headers=auth_headers)
         
         assert response.status_code == 404
@@ -106,8 +111,7 @@ class TestProfiles:
     def test_search_profiles_success(self, client: TestClient, auth_headers: Dict[str, str], sample_profile_data: Dict[str, Any]):
         """Test searching profiles."""
         # Create a public profile first
-        public_profile_data = sample_profile_data.copy()
-        public_profile_data["is_profile_public"] = "public"
+        public_profile_data = {**sample_profile_data, "is_profile_public": "public"}
         response = client.post("/api/v1/profiles/", json=public_profile_data, headers=auth_headers)
         assert response.status_code == 200
         
@@ -116,9 +120,7 @@ class TestProfiles:
         
         assert response.status_code == 200
         data = response.json()
-        assert "results" in data
-        assert "total" in data
-        assert "query" in data
+        assert_schema(data, {"results": object, "total": object, "query": object})
         assert data["query"] == "John"
 
     def test_search_profiles_short_query(self, client: TestClient, auth_headers: Dict[str, str]):
@@ -139,8 +141,7 @@ class TestProfiles:
     def test_get_public_profiles(self, client: TestClient, auth_headers: Dict[str, str], sample_profile_data: Dict[str, Any]):
         """Test getting all public profiles."""
         # Create a public profile
-        public_profile_data = sample_profile_data.copy()
-        public_profile_data["is_profile_public"] = "public"
+        public_profile_data = {**sample_profile_data, "is_profile_public": "public"}
         response = client.post("/api/v1/profiles/", json=public_profile_data, headers=auth_headers)
         assert response.status_code == 200
         
@@ -149,9 +150,7 @@ class TestProfiles:
         
         assert response.status_code == 200
         data = response.json()
-        assert "results" in data
-        assert "total" in data
-        assert isinstance(data["results"], list)
+        assert_schema(data, {"results": list, "total": object})
 
     def test_get_public_profiles_pagination(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test public profiles pagination."""
@@ -183,30 +182,6 @@ class TestProfiles:
         data = response.json()
         assert data["message"] == "Profile deleted successfully"
 
-    def test_delete_profile_unauthorized(self, client: TestClient):
-        """Test deleting profile without authentication."""
-        response = client.delete("/api/v1/profiles/")
-        assert response.status_code == 401
-
-    def test_upload_avatar_unauthorized(self, client: TestClient):
-        """Test uploading avatar without authentication."""
-        # Create a dummy image file
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp_file:
-            tmp_file.write(b"dummy image content")
-            tmp_file_path = tmp_file.name
-        
-        try:
-            with open(tmp_file_path, "rb") as f:
-                response = client.post("/api/v1/profiles/upload-avatar", files={"file": f})
-                assert response.status_code == 401
-        finally:
-            os.unlink(tmp_file_path)
-
-    def test_delete_avatar_unauthorized(self, client: TestClient):
-        """Test deleting avatar without authentication."""
-        response = client.delete("/api/v1/profiles/avatar")
-        assert response.status_code == 401
-
     def test_delete_avatar_no_profile(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test deleting avatar when profile doesn't exist."""
         response = client.delete("/api/v1/profiles/avatar", headers=auth_headers)
@@ -2,9 +2,21 @@
 Unit tests for session endpoints.
 """
 
+import pytest
+from uuid import uuid4
 from fastapi.testclient import TestClient
 from typing import Dict, Any
-from uuid import uuid4
+from sqlalchemy.orm import Session, sessionmaker
+from app.models.user import User
+from app.schemas.user import UserUpdate
+from app.services import session_service as session_service_module
+from app.services.session_service import session_service
+from app.services.user_service import user_service
+from tests._helpers import assert_schema
+
+
+# Well-formed id that never matches a row
+NONEXISTENT_ID = "00000000-0000-4000-8000-000000000000"
 
 
 class TestSessions:
@@ -16,10 +28,7 @@ class TestSessions:
         
         assert response.status_code == 200
         data = response.json()
-        assert "message" in data
-        assert "session_count" in data
-        assert "active_only" in data
-        assert isinstance(data["session_count"], int)
+        assert_schema(data, {"message": str, "session_count": int, "active_only": bool})
         assert data["session_count"] >= 0
 
     def test_get_my_sessions_inactive_included(self, client: TestClient, auth_headers: Dict[str, str]):
@@ -38,7 +47,7 @@ class TestSessions:
 
     def test_revoke_session_not_found(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test revoking a non-existent session."""
-        fake_session_id = str(uuid4())
+        fake_session_id = NONEXISTENT_ID
         response = client.delete(f"/api/v1/sessions/{fake_session_id}", headers=auth_headers)
         
         assert response.status_code == 404
@@ -47,7 +56,7 @@ class TestSessions:
 
     def test_revoke_session_unauthorized(self, client: TestClient):
         """Test revoking session without authentication."""
-        fake_session_id = str(uuid4())
+        fake_session_id = NONEXISTENT_ID
         response = client.delete(f"/api/v1/sessions/{fake_session_id}")
         assert response.status_code == 401
 
@@ -57,9 +66,7 @@ class TestSessions:
         
         assert response.status_code == 200
         data = response.json()
-        assert "message" in data
-        assert "revoked_count" in data
-        assert isinstance(data["revoked_count"], int)
+        assert_schema(data, {"message": str, "revoked_count": int})
         assert data["revoked_count"] >= 0
 
     def test_revoke_all_sessions_include_current(self, client: TestClient, auth_headers: Dict[str, str]):
@@ -86,3 +93,54 @@ class TestSessions:
         """Test cleanup expired sessions without authentication."""
         response = client.post("/api/v1/sessions/cleanup")
         assert response.status_code == 401
+
+    @pytest.mark.parametrize("action", ["deactivate", "delete"])
+    def test_disabled_user_sessions_leave_cache(self, test_db: Session, auth_user: User, action: str):
+        """Test deactivating or deleting a user drops their cached sessions on commit."""
+        access_token = f"access_{uuid4().hex}"
+        session_service.create_session(
+            test_db, user_id=auth_user.id, access_token=access_token, refresh_token=f"refresh_{uuid4().hex}"
+        )
+        test_db.commit()
+        session = session_service.validate_session(test_db, access_token=access_token)
+        token_hash = session_service.create_token_hash(access_token)
+        assert token_hash in session_service_module._session_cache
+        
+        if action == "deactivate":
+            user_service.update_user(
+                test_db, current_user=auth_user, user_id=auth_user.id, user_in=UserUpdate(is_active=False)
+            )
+        else:
+            user_service.delete_user(test_db, user_id=auth_user.id)
+        assert token_hash not in session_service_module._session_cache
+        
+        # A concurrent request re-caching the session before commit is undone
+        session_service_module._cache_session(token_hash, session)
+        test_db.commit()
+        assert token_hash not in session_service_module._session_cache
+
+    def test_session_activity_flush_requeues_on_failure(self, test_db: Session, auth_user: User, monkeypatch):
+        """Test buffered last_activity survives a failed flush and is written by the next one."""
+        access_token = f"access_{uuid4().hex}"
+        created = session_service.create_session(
+            test_db, user_id=auth_user.id, access_token=access_token, refresh_token=f"refresh_{uuid4().hex}"
+        )
+        test_db.commit()
+        session_service.validate_session(test_db, access_token=access_token)
+        assert created.id in session_service_module._activity_buffer
+        
+        flush_db = sessionmaker(bind=test_db.connection(), join_transaction_mode="create_savepoint")
+        
+        def fail(*args, **kwargs):
+            raise RuntimeError("database unavailable")
+        
+        with monkeypatch.context() as patch:
+            patch.setattr(session_service_module.session_crud, "bulk_update_last_activity", fail)
+            with pytest.raises(RuntimeError):
+                session_service_module.flush_session_activity(flush_db)
+        recorded = session_service_module._activity_buffer[created.id]
+        
+        assert session_service_module.flush_session_activity(flush_db) >= 1
+        assert created.id not in session_service_module._activity_buffer
+        test_db.expire_all()
+        assert test_db.get(type(created), created.id).last_activity.replace(tzinfo=None) == recorded.replace(tzinfo=None)
@@ -6,6 +6,12 @@ import pytest
 from fastapi.testclient import TestClient
 from typing import Dict, Any
 from uuid import uuid4
+from app.models.user import User
+from tests._helpers import assert_schema
+
+
+# Well-formed id that never matches a row
+NONEXISTENT_ID = "00000000-0000-4000-8000-000000000000"
 
 
 class TestUsers:
@@ -50,6 +56,24 @@ class TestUsers:
         response = client.post("/api/v1/users/", json=duplicate_data)
         assert response.status_code == 400
 
+    def test_create_user_duplicate_differs_only_in_case(self, client: TestClient, test_user_data: Dict[str, Any]):
+        """Test username and email uniqueness ignores case."""
+        response = client.post("/api/v1/users/", json=test_user_data)
+        assert response.status_code == 201
+        
+        duplicate_data = test_user_data.copy()
+        duplicate_data["username"] = test_user_data["username"].upper()
+        duplicate_data["email"] = test_user_data["email"].upper()
+        
+        response = client.post("/api/v1/users/", json=duplicate_data)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Username already registered"
+        
+        duplicate_data["username"] = f"different_{uuid4().hex[:8]}"
+        response = client.post("/api/v1/users/", json=duplicate_data)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Email already registered"
+
     def test_create_user_invalid_email(self, client: TestClient, test_user_data: Dict[str, Any]):
         """Test creating user with invalid email."""
         invalid_data = test_user_data.copy()
@@ -68,27 +92,14 @@ class TestUsers:
         # In production, you might want to add password validation
         assert response.status_code in [201, 422]  # Accept either valid creation or validation error
 
-    def test_create_user_missing_fields(self, client: TestClient):
+    @pytest.mark.parametrize("payload", [
+        {"email": "test@example.com", "password": "testpassword123"},  # Missing username
+        {"username": "testuser", "password": "testpassword123"},  # Missing email
+        {"username": "testuser", "email": "test@example.com"},  # Missing password
+    ])
+    def test_create_user_missing_fields(self, client: TestClient, payload: Dict[str, Any]):
         """Test creating user with missing required fields."""
-        # Missing username
-        response = client.post("/api/v1/users/", json={
-            "email": "test@example.com",
-            "password": "testpassword123"
-        })
-        assert response.status_code == 422
-        
-        # Missing email
-        response = client.post("/api/v1/users/", json={
-            "username": "testuser",
-            "password": "testpassword123"
-        })
-        assert response.status_code == 422
-        
-        # Missing password
-        response = client.post("/api/v1/users/", json={
-            "username": "testuser",
-            "email": "test@example.com"
-        })
+        response = client.post("/api/v1/users/", json=payload)
         assert response.status_code == 422
 
     def test_get_current_user(self, client: TestClient, auth_headers: Dict[str, str]):
@@ -97,9 +108,7 @@ class TestUsers:
         
         assert response.status_code == 200
         data = response.json()
-        assert "id" in data
-        assert "username" in data
-        assert "email" in data
+        assert_schema(data, {"id": object, "username": object, "email": object})
         assert "password" not in data
 
     def test_get_current_user_unauthorized(self, client: TestClient):
@@ -113,12 +122,9 @@ class TestUsers:
         response = client.get("/api/v1/users/me", headers=headers)
         assert response.status_code == 401
 
-    def test_get_user_by_id_own_user(self, client: TestClient, auth_headers: Dict[str, str]):
+    def test_get_user_by_id_own_user(self, client: TestClient, auth_headers: Dict[str, str], auth_user: User):
         """Test getting user by ID (own user)."""
-        # First get current user to get the ID
-        response = client.get("/api/v1/users/me", headers=auth_headers)
-        assert response.status_code == 200
-        user_id = response.json()["id"]
+        user_id = str(auth_user.id)
         
         # Get user by ID
         response = client.get(f"/api/v1/users/{user_id}", headers=auth_headers)
@@ -144,16 +150,14 @@ class TestUsers:
 
     def test_get_user_by_id_not_found(self, client: TestClient, auth_headers: Dict[str, str]):
         """Test getting user by non-existent ID."""
-        fake_id = str(uuid4())
+        fake_id = NONEXISTENT_ID
         response = client.get(f"/api/v1/users/{fake_id}", headers=auth_headers)
         # The API first checks permissions, so non-superuser gets 403 before 404
         assert response.status_code == 403
 
-    def test_update_user_own_profile(self, client: TestClient, auth_headers: Dict[str, str]):
+    def test_update_user_own_profile(self, client: TestClient, auth_headers: Dict[str, str], auth_user: User):
         """Test updating own user profile."""
-        # Get current user ID
-        response = client.get("/api/v1/users/me", headers=auth_headers)
-        user_id = response.json()["id"]
+        user_id = str(auth_user.id)
         
         # Update user
         update_data = {
@@ -169,7 +173,7 @@ class TestUsers:
 
     def test_update_user_unauthorized(self, client: TestClient):
         """Test updating user without authentication."""
-        fake_id = str(uuid4())
+        fake_id = NONEXISTENT_ID
         update_data = {"username": "newusername"}
         response = client.put(f"/api/v1/users/{fake_id}", json=update_data)
         assert response.status_code == 401
@@ -180,11 +184,9 @@ class TestUsers:
         # Should be forbidden for regular user
         assert response.status_code == 403
 
-    def test_delete_user_superuser_only(self, client: TestClient, auth_headers: Dict[str, str]):
+    def test_delete_user_superuser_only(self, client: TestClient, auth_headers: Dict[str, str], auth_user: User):
         """Test deleting user (should require superuser)."""
-        # Get current user ID
-        response = client.get("/api/v1/users/me", headers=auth_headers)
-        user_id = response.json()["id"]
+        user_id = str(auth_user.id)
         
         # Try to delete (should be forbidden for regular user)
         response = client.delete(f"/api/v1/users/{user_id}", headers=auth_headers)
@@ -2,51 +2,100 @@
 Pytest configuration and shared fixtures for the Fast Users API tests.
 """
 
-import pytest
-import tempfile
 import os
+
+# Select the test settings before anything imports app.core.config
+os.environ["ENVIRONMENT"] = "testing"
+
+import pytest
 from typing import Generator, Dict, Any
 from uuid import uuid4
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from app.main import app
+from sqlalchemy.pool import StaticPool
+from app.api.api import api_router
+from app.main import EXCEPTION_HANDLERS
 from app.db.base import Base
 from app.api.deps import get_db
 from app.crud.user import user as user_crud
+from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.config import settings
+from app.core.security import create_access_token, pwd_context
+
+# In-memory database, shared by every connection through StaticPool
+TEST_DATABASE_URL = "sqlite://"
 
-# Override environment for testing
-os.environ["ENVIRONMENT"] = "testing"
 
-# Use testing database URL
-TEST_DATABASE_URL = settings.get_database_url()
+def create_test_app() -> FastAPI:
+    """Build the API routes and exception handlers, without middleware or lifespan."""
+    test_app = FastAPI()
+    test_app.include_router(api_router)
+    for exc_class, handler in EXCEPTION_HANDLERS:
+        test_app.add_exception_handler(exc_class, handler)
+    return test_app
+
+
+app = create_test_app()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing() -> Generator[None, None, None]:
+    """Store passwords as plaintext so signups and logins in tests skip bcrypt.
+
+    Swapping the shared ``CryptContext`` covers every caller of
+    ``app.core.security``, including names imported into other modules.
+    """
+    original = pwd_context.to_dict()
+    pwd_context.load({"schemes": ["plaintext"]})
+    
+    yield
+    
+    pwd_context.load(original)
 
 
 @pytest.fixture(scope="session")
 def test_engine():
-    """Create a test database engine."""
+    """Create the test database engine and schema once per test session."""
     engine = create_engine(
         TEST_DATABASE_URL, 
-        connect_args={"check_same_thread": False}
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
     )
     
+    # pysqlite manages transactions itself and breaks SAVEPOINT handling;
+    # leave BEGIN to SQLAlchemy so savepoints nest inside the outer transaction
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     # Create all tables
     Base.metadata.create_all(bind=engine)
     
     yield engine
     
-    # Clean up
-    Base.metadata.drop_all(bind=engine)
-    if os.path.exists("./test_users.db"):
-        os.remove("./test_users.db")
+    engine.dispose()
 
 
 @pytest.fixture(scope="function")
 def test_db(test_engine) -> Generator[Session, None, None]:
-    """Create a fresh database session for each test."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    """Create a database session for each test, rolled back afterwards.
+
+    The session runs inside an outer transaction on its connection and turns
+    its own ``commit()``/``rollback()`` calls into SAVEPOINTs, so a rollback
+    mid-test (e.g. after an IntegrityError) keeps earlier test data and each
+    test still starts from the empty schema.
+    """
+    TestingSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        join_transaction_mode="create_savepoint"
+    )
     
     connection = test_engine.connect()
     transaction = connection.begin()
@@ -59,24 +108,24 @@ def test_db(test_engine) -> Generator[Session, None, None]:
     connection.close()
 
 
-@pytest.fixture(scope="function")
-def client(test_db: Session) -> Generator[TestClient, None, None]:
-    """Create a test client with database dependency override."""
-    def override_get_db():
-        try:
-            yield test_db
-        finally:
-            pass
-    
-    app.dependency_overrides[get_db] = override_get_db
-    
+@pytest.fixture(scope="session")
+def client() -> Generator[TestClient, None, None]:
+    """Create one test client per test session."""
     with TestClient(app) as test_client:
         yield test_client
+
+
+@pytest.fixture(autouse=True)
+def override_get_db(test_db: Session) -> Generator[None, None, None]:
+    """Point the ``get_db`` dependency at the current test's session."""
+    app.dependency_overrides[get_db] = lambda: test_db
     
-    app.dependency_overrides.clear()
+    yield
+    
+    app.dependency_overrides.pop(get_db, None)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_user_data() -> Dict[str, Any]:
     """Standard test user data."""
     return {
@@ -87,58 +136,26 @@ def test_user_data() -> Dict[str, Any]:
 
 
 @pytest.fixture
-def superuser_data() -> Dict[str, Any]:
-    """Standard superuser data."""
-    return {
-        "username": f"admin_{uuid4().hex[:8]}",
-        "email": f"admin_{uuid4().hex[:8]}@example.com",
-        "password": "adminpassword123",
-        "is_superuser": True
-    }
-
-
-@pytest.fixture
-def test_user(test_db: Session, test_user_data: Dict[str, Any]):
-    """Create a test user in the database."""
-    user_create = UserCreate(**test_user_data)
-    user = user_crud.create(test_db, obj_in=user_create)
+def auth_user(test_db: Session, test_user_data: Dict[str, Any]) -> User:
+    """Create the user that ``user_token`` and ``auth_headers`` authenticate as."""
+    user = user_crud.create(test_db, obj_in=UserCreate(**test_user_data))
     test_db.commit()
-    test_db.refresh(user)
     return user
 
 
 @pytest.fixture
-def superuser(test_db: Session, superuser_data: Dict[str, Any]):
-    """Create a superuser in the database."""
-    user_create = UserCreate(**superuser_data)
-    user = user_crud.create(test_db, obj_in=user_create)
-    # Manually set superuser status since it's not in UserCreate
-    user.is_superuser = True
-    test_db.commit()
-    test_db.refresh(user)
-    return user
+def user_token(auth_user: User) -> str:
+    """Return an access token for ``auth_user``.
 
-
-@pytest.fixture
-def user_token(client: TestClient, test_user_data: Dict[str, Any]) -> str:
-    """Create a user and return their authentication token."""
-    # Create user
-    response = client.post("/api/v1/users/", json=test_user_data)
-    assert response.status_code == 201
-    
-    # Login and get token
-    login_data = {
-        "username": test_user_data["username"],
-        "password": test_user_data["password"]
-    }
-    response = client.post("/api/v1/auth/login", data=login_data)
-    assert response.status_code == 200
-    return response.json()["access_token"]
+    The token is minted directly; the HTTP login flow is covered by the
+    auth tests.
+    """
+    return create_access_token(subject=auth_user.username)
 
 
 @pytest.fixture
-def superuser_token(client: TestClient, test_db: Session) -> str:
-    """Create a superuser and return their authentication token."""
+def superuser_token(test_db: Session) -> str:
+    """Create a superuser and return an access token for them."""
     # Create superuser data
     superuser_data = {
         "username": "test_admin",
@@ -153,16 +170,8 @@ def superuser_token(client: TestClient, test_db: Session) -> str:
     # Make them a superuser
     user.is_superuser = True
     test_db.commit()
-    test_db.refresh(user)
     
-    # Login and get token
-    login_data = {
-        "username": superuser_data["username"],
-        "password": superuser_data["password"]
-    }
-    response = client.post("/api/v1/auth/login", data=login_data)
-    assert response.status_code == 200
-    return response.json()["access_token"]
+    return create_access_token(subject=user.username)
 
 
 @pytest.fixture
@@ -177,7 +186,7 @@ def superuser_headers(superuser_token: str) -> Dict[str, str]:
     return {"Authorization": f"Bearer {superuser_token}"}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_profile_data() -> Dict[str, Any]:
     """Sample profile data for testing."""
     return {
@@ -197,7 +206,7 @@ def sample_profile_data() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_address_data() -> Dict[str, Any]:
     """Sample address data for testing."""
     return {
@@ -217,3 +226,13 @@ def sample_address_data() -> Dict[str, Any]:
         "is_default": True,
         "delivery_instructions": "Leave at door"
     }
+
+
+@pytest.fixture
+def created_address(
+    client: TestClient, auth_headers: Dict[str, str], sample_address_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Create an address for the authenticated user and return its JSON."""
+    response = client.post("/api/v1/addresses/", json=sample_address_data, headers=auth_headers)
+    assert response.status_code == 201
+    return response.json()
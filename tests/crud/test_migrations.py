@@ -0,0 +1,62 @@
+"""
+Tests for the one-off data conversions run through ``python -m app.cli``.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.init_db import convert_legacy_profile_flags
+from app.models.profile import Profile
+
+
+@pytest.fixture
+def legacy_engine():
+    """A throwaway SQLite database with the current schema."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _insert_legacy_profile(engine, *, show_email: str, show_phone: str) -> uuid.UUID:
+    """Insert a profile row the way the old String(10) columns stored it."""
+    profile_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO profiles (id, user_id, is_profile_public, show_email, show_phone, is_deleted) "
+                "VALUES (:id, :user_id, 'public', :show_email, :show_phone, 0)"
+            ),
+            {
+                "id": profile_id.bytes,
+                "user_id": uuid.uuid4().bytes,
+                "show_email": show_email,
+                "show_phone": show_phone,
+            },
+        )
+    return profile_id
+
+
+def test_convert_legacy_profile_flags(legacy_engine):
+    """Text 'false'/'true' flags read back as False/True after conversion."""
+    hidden_id = _insert_legacy_profile(legacy_engine, show_email="false", show_phone="false")
+    shown_id = _insert_legacy_profile(legacy_engine, show_email="true", show_phone="false")
+
+    assert convert_legacy_profile_flags(legacy_engine) == 4
+    assert convert_legacy_profile_flags(legacy_engine) == 0
+
+    db = sessionmaker(bind=legacy_engine)()
+    try:
+        hidden = db.get(Profile, hidden_id)
+        shown = db.get(Profile, shown_id)
+        assert hidden.show_email is False
+        assert hidden.show_phone is False
+        assert shown.show_email is True
+        assert shown.show_phone is False
+        assert hidden.is_profile_public == "public"
+    finally:
+        db.close()
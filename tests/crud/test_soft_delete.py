@@ -0,0 +1,95 @@
+"""
+Tests that soft-deleted rows are hidden however a query is built.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app.crud.session import session as session_crud
+from app.crud.user import user as user_crud
+from app.models.address import Address
+from app.models.session import Session as SessionModel
+from app.models.user import User
+
+
+@pytest.fixture
+def deleted_user(test_db: Session) -> Dict[str, Any]:
+    """A soft-deleted user with a soft-deleted session and address, plus a live address.
+
+    Returns the user's id, username, email and session token hash.
+    """
+    suffix = uuid4().hex[:8]
+    user = User(
+        username=f"deleted_{suffix}",
+        email=f"deleted_{suffix}@example.com",
+        hashed_password="x",
+        is_deleted=True,
+    )
+    test_db.add(user)
+    test_db.flush()
+    address_fields = dict(
+        user_id=user.id, label="Home", first_name="A", last_name="B",
+        address_line_1="1 Main St", city="Town", state="ST", postal_code="00000",
+    )
+    token_hash = f"token_{suffix}".encode().ljust(32, b"\0")
+    test_db.add_all([
+        SessionModel(
+            user_id=user.id,
+            token_hash=token_hash,
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+            is_active=True,
+            is_deleted=True,
+        ),
+        Address(**address_fields, is_deleted=True),
+        Address(**address_fields),
+    ])
+    values = {"id": user.id, "username": user.username, "email": user.email, "token_hash": token_hash}
+    test_db.commit()
+    # Later lookups must go to the database, not the identity map
+    test_db.expunge_all()
+    return values
+
+
+def test_lookups_hide_soft_deleted_rows(test_db: Session, deleted_user: Dict[str, Any]):
+    """Test every lookup style skips soft-deleted rows."""
+    user_id, username, email = deleted_user["id"], deleted_user["username"], deleted_user["email"]
+    token_hash = deleted_user["token_hash"]
+
+    assert test_db.query(User).filter(User.username == username).first() is None
+    assert test_db.execute(select(User).where(User.id == user_id)).scalars().first() is None
+    assert test_db.get(User, user_id) is None
+    assert user_crud.get(test_db, id=user_id) is None
+    assert user_crud.get_by_username(test_db, username=username) is None
+    assert user_crud.get_by_email(test_db, email=email) is None
+    assert session_crud.get_by_token_hash(test_db, token_hash=token_hash) is None
+    assert session_crud.has_active_session(test_db, user_id=user_id) is False
+    assert session_crud.user_exists_and_session_count(test_db, user_id=user_id) == (False, 0)
+
+
+def test_relationship_load_hides_soft_deleted_rows(test_db: Session, deleted_user: Dict[str, Any]):
+    """Test lazy-loaded collections skip soft-deleted rows."""
+    user = test_db.get(User, deleted_user["id"], execution_options={"include_deleted": True})
+    assert len(user.addresses) == 1
+
+
+def test_include_deleted_and_unique_checks_see_soft_deleted_rows(test_db: Session, deleted_user: Dict[str, Any]):
+    """Test include_deleted and signup conflict checks still see soft-deleted rows."""
+    found = test_db.execute(
+        select(User).where(User.id == deleted_user["id"]).execution_options(include_deleted=True)
+    ).scalars().first()
+    assert found is not None
+    assert user_crud.get_conflicting(
+        test_db, username=deleted_user["username"], email=deleted_user["email"]
+    ) == (True, True)
+
+
+def test_lambda_stmt_on_soft_deletable_model_rejected(test_db: Session):
+    """Test lambda statements can't bypass the soft-delete filter."""
+    username = "anyone"
+    with pytest.raises(TypeError):
+        test_db.execute(lambda_stmt(lambda: select(User).where(User.username == username)))